@@ -0,0 +1,248 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from scrapers.base import FIELD_PROFILES, DEFAULT_OPTIONS, scrape_options
+from scrapers.registry import platforms, resolve_platform, scrape_many
+
+# Jumlah job yang berjalan bersamaan; target di dalam job tetap diparalelkan oleh run_batch
+JOB_WORKERS = int(os.environ.get("SCRAPER_JOB_WORKERS", "2"))
+# Job selesai yang disimpan di memori sebelum yang tertua dibuang
+MAX_FINISHED_JOBS = 200
+
+
+def _positive_int(value, name):
+    # bool adalah subclass int; float/list/dict dari JSON ditolak
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError(f"{name} must be a positive integer")
+    try:
+        value = int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a positive integer") from None
+    if value < 1:
+        raise ValueError(f"{name} must be a positive integer")
+    return value
+
+
+def _flag(value, name):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.lower() in ("true", "false", "1", "0"):
+        return value.lower() in ("true", "1")
+    raise ValueError(f"{name} must be a boolean")
+
+
+def parse_options(raw):
+    """Validasi opsi scraping (body JSON atau query string); melempar ValueError untuk input tidak valid"""
+    if not isinstance(raw, dict):
+        raise ValueError("options must be a JSON object")
+    options = scrape_options({k: raw[k] for k in DEFAULT_OPTIONS if k in raw})
+    options["max_posts"] = _positive_int(options["max_posts"], "max_posts")
+    if not isinstance(options["fields"], str) or options["fields"] not in FIELD_PROFILES:
+        raise ValueError(f"Unsupported fields profile, use one of {list(FIELD_PROFILES)}")
+    if options["method"] not in ("hybrid", "deep"):
+        raise ValueError("method must be 'hybrid' or 'deep'")
+    options["incremental"] = _flag(options["incremental"], "incremental")
+    if options["slice_days"] is not None:
+        options["slice_days"] = _positive_int(options["slice_days"], "slice_days")
+    if options["since_date"]:
+        try:
+            options["since_date"] = datetime.strptime(options["since_date"], "%Y-%m-%d").date()
+        except (TypeError, ValueError):
+            raise ValueError("since_date must be a date string in YYYY-MM-DD format") from None
+    return options
+
+
+def parse_job_request(payload):
+    """Validasi body POST /api/jobs; mengembalikan (platform, targets, options) atau melempar ValueError"""
+    if not isinstance(payload, dict):
+        raise ValueError("Body must be a JSON object")
+
+    platform = resolve_platform(payload.get("platform"))
+    if not platform:
+        raise ValueError(f"Unsupported platform, use one of {[p.lower() for p in platforms()]}")
+
+    targets = payload.get("targets")
+    if isinstance(targets, str):
+        targets = [targets]
+    if not isinstance(targets, list) or not targets:
+        raise ValueError("targets must be a non-empty list")
+    targets = [str(t).strip() for t in targets if str(t).strip()]
+    if not targets:
+        raise ValueError("targets must be a non-empty list")
+
+    return platform, targets, parse_options(payload.get("options") or {})
+
+
+class Job:
+    def __init__(self, platform, targets, options, stream=False):
+        self.id = uuid.uuid4().hex
+        self.platform = platform
+        self.targets = targets
+        self.options = options
+        # Mode stream: post dikirim ke satu konsumen begitu diproduksi scraper, lalu tidak disimpan
+        self.stream = stream
+        self.status = "queued"
+        self.error = None
+        self.done = 0
+        self.failed = 0
+        self.results = {}
+        # Event berurutan (jenis, idx, post): "post" (mode stream) dan "done" per target selesai
+        self.events = []
+        self._dropped = 0
+        self._claimed = False
+        self._detached = False
+        self._streamed = {}
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.lock = threading.Condition()
+
+    @property
+    def finished(self):
+        return self.status in ("done", "failed")
+
+    def on_post(self, idx, post):
+        with self.lock:
+            self._streamed[idx] = self._streamed.get(idx, 0) + 1
+            if not self._detached:
+                self.events.append(("post", idx, post))
+                self.lock.notify_all()
+
+    def on_target_done(self, idx, target, result, done_count):
+        with self.lock:
+            self.results[idx] = result
+            self.events.append(("done", idx, None))
+            self.done = done_count
+            if isinstance(result, dict) and result.get("error"):
+                self.failed += 1
+            if self._detached:
+                self._compact(idx)
+            self.lock.notify_all()
+
+    def set_status(self, status, error=None):
+        with self.lock:
+            self.status = status
+            self.error = error
+            if status == "running":
+                self.started_at = time.time()
+            elif self.finished:
+                self.finished_at = time.time()
+            self.lock.notify_all()
+
+    def claim_stream(self):
+        """False jika job mode stream sudah punya konsumen (event-nya hanya dikirim sekali)"""
+        with self.lock:
+            if self.stream and self._claimed:
+                return False
+            self._claimed = True
+            return True
+
+    def detach(self):
+        """Konsumen stream terputus: post berikutnya tidak lagi ditampung"""
+        with self.lock:
+            if not self.stream:
+                return
+            self._detached = True
+            self._dropped += len(self.events)
+            self.events = []
+            for idx in self.results:
+                self._compact(idx)
+
+    def _compact(self, idx):
+        # Hasil tetap objek yang sama dengan yang dipegang run_batch, jadi posts-nya ikut lepas
+        result = self.results[idx]
+        if self.stream and isinstance(result, dict) and result.get("posts"):
+            self._streamed[idx] = self._streamed.get(idx, 0) + len(result["posts"])
+            result["posts"] = []
+        if self.stream and isinstance(result, dict) and not result.get("error"):
+            result["streamed_posts"] = self._streamed.get(idx, 0)
+
+    def release(self, idx):
+        """Dipanggil setelah hasil target dikirim; mode stream hanya menyimpan ringkasan"""
+        with self.lock:
+            self._compact(idx)
+
+    def iter_events(self, poll_timeout=15.0):
+        """
+        Generator batch [(jenis, idx, payload), ...] sesuai urutan kejadian, menunggu event
+        berikutnya sampai job selesai. payload = post ("post") atau hasil target ("done").
+        Batch kosong dikirim jika tidak ada event selama poll_timeout (heartbeat).
+        """
+        pos = 0
+        while True:
+            timed_out = False
+            with self.lock:
+                if pos >= self._dropped + len(self.events) and not self.finished:
+                    timed_out = not self.lock.wait(timeout=poll_timeout)
+                batch = [(kind, idx, post if kind == "post" else self.results[idx])
+                         for kind, idx, post in self.events[pos - self._dropped:]]
+                pos += len(batch)
+                if self.stream:
+                    # Konsumen tunggal: event yang sudah diambil tidak disimpan lagi
+                    self._dropped += len(self.events)
+                    self.events = []
+                exhausted = self.finished and pos >= self._dropped + len(self.events)
+            if batch or timed_out:
+                yield batch
+            if exhausted:
+                return
+
+    def ordered_results(self):
+        """Hasil yang sudah selesai, urut sesuai target input"""
+        with self.lock:
+            return [self.results[i] for i in sorted(self.results)]
+
+    def to_dict(self):
+        with self.lock:
+            return {
+                "job_id": self.id,
+                "platform": self.platform,
+                "status": self.status,
+                "error": self.error,
+                "stream": self.stream,
+                "progress": {"done": self.done, "total": len(self.targets), "failed": self.failed},
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+            }
+
+
+class JobManager:
+    """Antrian job scraping di memori, dijalankan oleh pool worker background"""
+
+    def __init__(self, workers=JOB_WORKERS, max_finished=MAX_FINISHED_JOBS):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scrape-job")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_finished = max_finished
+
+    def submit(self, platform, targets, options, stream=False):
+        job = Job(platform, targets, options, stream=stream)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._evict()
+        self._pool.submit(self._run, job)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _evict(self):
+        finished = [jid for jid, j in self._jobs.items() if j.finished]
+        for jid in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[jid]
+
+    def _run(self, job):
+        job.set_status("running")
+        try:
+            scrape_many(job.platform, job.targets, job.options, on_done=job.on_target_done,
+                        on_post=job.on_post if job.stream else None)
+            job.set_status("done")
+        except Exception as e:
+            job.set_status("failed", str(e))
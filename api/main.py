@@ -1,19 +1,90 @@
-from flask import Flask, jsonify, request
-from scrapers.instagram import InstagramScraper
+from flask import Flask, Response, jsonify, request
+from utils.replay import install_from_env
+install_from_env()
+from scrapers import registry
+from api.jobs import JobManager, parse_job_request, parse_options
+from api.streaming import stream_job
 
 app = Flask(__name__)
+jobs = JobManager()
 
 @app.route('/api/scrape', methods=['GET'])
 def scrape():
-    platform = request.args.get('platform')
-    target = request.args.get('target')
-    
-    if platform == 'instagram':
-        # Secara scalable, API memanggil class yang sama
-        data = InstagramScraper().get_detailed_data(target)
-        return jsonify(data)
-    
-    return jsonify({"error": "Unsupported platform"}), 400
+    platform = registry.resolve_platform(request.args.get('platform'))
+    target = (request.args.get('target') or '').strip()
+    if not platform:
+        return jsonify({"error": "Unsupported platform"}), 400
+    if not target:
+        return jsonify({"error": "target is required"}), 400
+
+    # Secara scalable, API memanggil entry point yang sama dengan UI (Instagram default: Instaloader)
+    try:
+        # Parameter kosong (?max_posts=) diperlakukan seperti tidak dikirim
+        args = {k: v for k, v in request.args.items() if v != ''}
+        options = parse_options({"method": "deep", **args})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(registry.scrape(platform, target, options))
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    # Job dijalankan di background; klien polling status lalu mengambil hasil
+    try:
+        platform, targets, options = parse_job_request(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    job = jobs.submit(platform, targets, options)
+    return jsonify({
+        **job.to_dict(),
+        "status_url": f"/api/jobs/{job.id}",
+        "results_url": f"/api/jobs/{job.id}/results",
+    }), 202
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    job = jobs.get(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/api/jobs/<job_id>/results', methods=['GET'])
+def job_results(job_id):
+    job = jobs.get(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    # Hasil parsial (target yang sudah selesai) dikirim selama job masih berjalan
+    return jsonify({**job.to_dict(), "complete": job.finished, "results": job.ordered_results()})
+
+@app.route('/api/jobs/<job_id>/stream', methods=['GET'])
+def job_stream(job_id):
+    # NDJSON: satu baris per profil dan per post, dikirim begitu tiap target selesai
+    job = jobs.get(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    if not job.claim_stream():
+        return jsonify({"error": "Job is already being streamed"}), 409
+    return _ndjson_response(job)
+
+@app.route('/api/stream', methods=['POST'])
+def submit_and_stream():
+    # Sama dengan POST /api/jobs, tetapi hasil langsung di-stream di response yang sama
+    try:
+        platform, targets, options = parse_job_request(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    # Mode stream: post dikirim begitu diproduksi dan tidak disimpan di job setelah terkirim
+    job = jobs.submit(platform, targets, options, stream=True)
+    job.claim_stream()
+    return _ndjson_response(job)
+
+def _ndjson_response(job):
+    compress = "gzip" in request.headers.get("Accept-Encoding", "").lower()
+    headers = {"X-Job-Id": job.id, "Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+    return Response(stream_job(job, compress=compress), mimetype="application/x-ndjson", headers=headers)
 
 if __name__ == '__main__':
-    app.run(port=5000)
\ No newline at end of file
+    app.run(port=5000, threaded=True)
\ No newline at end of file
@@ -0,0 +1,62 @@
+import json
+import zlib
+
+
+def _line(record):
+    return json.dumps(record, ensure_ascii=False, default=str) + "\n"
+
+
+def post_line(job_id, platform, target, post):
+    return _line({"type": "post", "job_id": job_id, "platform": platform, "target": target, "post": post})
+
+
+def result_lines(job_id, platform, target, result):
+    """Satu hasil target -> baris NDJSON: satu baris profil lalu satu baris per post yang belum di-stream"""
+    base = {"job_id": job_id, "platform": platform, "target": target}
+    if not isinstance(result, dict) or result.get("error"):
+        error = result.get("error") if isinstance(result, dict) else "Empty result"
+        yield _line({"type": "error", **base, "error": error})
+        return
+
+    yield _line({"type": "profile", **base, "profile": result.get("profile_info", {}), "metadata": result.get("metadata", {})})
+    for post in result.get("posts") or []:
+        yield post_line(job_id, platform, target, post)
+
+
+def stream_job(job, compress=False):
+    """
+    Generator chunk NDJSON untuk sebuah job (satu batch event = satu flush).
+
+    Job mode stream mengirim baris post begitu scraper memproduksinya (baris profil menyusul saat
+    target selesai); scraper tanpa dukungan on_post dan job biasa dikirim per target yang selesai.
+    Dengan compress=True output berupa stream gzip yang di-flush (Z_SYNC_FLUSH) per batch,
+    sehingga klien tetap bisa mendekode baris secara bertahap.
+    """
+    gz = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+
+    def emit(lines):
+        chunk = "".join(lines).encode("utf-8")
+        if gz is None:
+            return chunk
+        return gz.compress(chunk) + gz.flush(zlib.Z_SYNC_FLUSH)
+
+    try:
+        for batch in job.iter_events():
+            if not batch:
+                # Heartbeat agar koneksi idle tidak diputus proxy selama target lama berjalan
+                yield emit([_line({"type": "progress", **job.to_dict()})])
+                continue
+            lines = []
+            for kind, idx, payload in batch:
+                if kind == "post":
+                    lines.append(post_line(job.id, job.platform, job.targets[idx], payload))
+                else:
+                    lines.extend(result_lines(job.id, job.platform, job.targets[idx], payload))
+                    job.release(idx)
+            yield emit(lines)
+    finally:
+        # Klien terputus (GeneratorExit) atau stream selesai: sisa post tidak perlu ditampung lagi
+        job.detach()
+
+    tail = emit([_line({"type": "end", **job.to_dict()})])
+    yield tail + gz.flush() if gz else tail
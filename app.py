@@ -1,16 +1,12 @@
 import streamlit as st
 import pandas as pd
-from ui.components import render_header, render_terminal_logs, render_documentation
+from utils.replay import install_from_env
+install_from_env()
+from ui.components import render_header, render_terminal_logs, render_cache_stats, render_documentation
+from utils.cache_stats import cache_stats_summary
 from ui.sidebar import render_sidebar
-# IMPORT DASHBOARD BARU
-from ui.dashboards.instagram_dash import render_instagram_dashboard
-from ui.dashboards.tiktok_dash import render_tiktok_dashboard
-from ui.dashboards.shopee_dash import render_shopee_dashboard
-from ui.dashboards.playstore_dash import render_playstore_dashboard
-from ui.dashboards.googlemaps_dash import render_googlemaps_dashboard
-from ui.dashboards.googlenews_dash import render_googlenews_dashboard
-from ui.dashboards.googlejobs_dash import render_googlejobs_dashboard
-from ui.dashboards.linkedin_dash import render_linkedin_dashboard
+# Dashboard per platform diambil dari registry (diimpor saat pertama dipakai)
+from scrapers.registry import get_dashboard
 
 
 st.set_page_config(page_title="Scraper Specialist", layout="wide")
@@ -66,27 +62,12 @@ with tab_dash:
 
 
             # 3. Routing Dashboard
-            if current_platform == "Instagram":
-                render_instagram_dashboard(df_profiles, df_posts)
-            # elif current_platform == "TikTok":
-            #     render_tiktok_dashboard(df_profiles, df_posts)
-            # Di dalam app.py (Bagian Dashboard TikTok)
-            elif current_platform == "TikTok":
-                if 'views' not in df_posts.columns:
-                    df_posts['views'] = 0
-                render_tiktok_dashboard(df_profiles, df_posts)
-            elif current_platform == "Shopee":
-                render_shopee_dashboard(df_profiles, df_posts)
-            elif current_platform == "PlayStore":
-                render_playstore_dashboard(df_profiles, df_posts)
-            elif current_platform == "GoogleMaps":
-                render_googlemaps_dashboard(df_profiles, df_posts)
-            elif current_platform == "GoogleNews":
-                render_googlenews_dashboard(df_profiles, df_posts)
-            elif current_platform == "GoogleJobs":
-                render_googlejobs_dashboard(df_profiles, df_posts)
-            elif current_platform == "LinkedIn":
-                render_linkedin_dashboard(df_profiles, df_posts)
+            if current_platform == "TikTok" and 'views' not in df_posts.columns:
+                df_posts['views'] = 0
+            render_dashboard = get_dashboard(current_platform)
+            if render_dashboard:
+                render_dashboard(df_profiles, df_posts)
 
 with tab_logs:
-    render_terminal_logs(st.session_state.logs)
\ No newline at end of file
+    render_terminal_logs(st.session_state.logs)
+    render_cache_stats(cache_stats_summary())
\ No newline at end of file
@@ -0,0 +1,55 @@
+"""
+Mengukur waktu batch end-to-end secara offline dengan fixture record/replay.
+
+Rekam sekali (butuh network), lalu ulangi berkali-kali tanpa network:
+    python -m benchmarks.bench_batch_replay record TikTok user1 user2
+    python -m benchmarks.bench_batch_replay replay TikTok user1 user2 --repeat 5
+
+Fixture default: .cache/replay/<platform>.jsonl (ubah dengan --fixture).
+"""
+import argparse
+import os
+import statistics
+import time
+
+from scrapers.registry import platforms, create_scraper, scrape_many
+from utils.disk_cache import CACHE_DIR
+from utils.replay import install
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("mode", choices=("record", "replay"))
+    parser.add_argument("platform", choices=platforms())
+    parser.add_argument("targets", nargs="+")
+    parser.add_argument("--max-posts", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--fixture")
+    args = parser.parse_args()
+
+    fixture = args.fixture or os.path.join(CACHE_DIR, "replay", f"{args.platform}.jsonl")
+    if args.mode == "record" and os.path.exists(fixture):
+        os.remove(fixture)
+    # Hook harus terpasang sebelum scraper (dan client httpx-nya) dibuat
+    store = install(args.mode, fixture)
+
+    repeat = 1 if args.mode == "record" else args.repeat
+
+    timings = []
+    for _ in range(repeat):
+        # Setiap pengulangan dilayani dari awal urutan rekaman
+        store.rewind()
+        scraper = create_scraper(args.platform)
+        start = time.perf_counter()
+        results = scrape_many(args.platform, args.targets, {"max_posts": args.max_posts}, scraper=scraper)
+        timings.append(time.perf_counter() - start)
+
+    errors = [r["error"] for r in results if isinstance(r, dict) and r.get("error")]
+    print(f"{args.mode} {args.platform}: {len(args.targets)} target, fixture {fixture}")
+    print(f"runs {len(timings)}  min {min(timings):.3f}s  median {statistics.median(timings):.3f}s")
+    for err in errors:
+        print(f"error: {err}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark parsing halaman Google Maps (tbm=lcl) dari fixture HTML tersimpan.
+
+Membandingkan parser satu kali jalan (parse_local_results) dengan regex lama
+yang menyejajarkan nama dan rating berdasarkan posisi, pada dua layout:
+- googlemaps_lcl.html       : container listing bertanda (VkpGBb/data-cid)
+- googlemaps_lcl_basic.html : layout dasar (container X7NTVe), yang ditulis untuk regex lama
+
+Parser per blok mengambil nama, rating, ulasan, kategori, alamat dan link per listing,
+sehingga di layout dasar ~1.3-1.5x lebih lambat daripada dua regex lama yang hanya
+mengambil nama & rating (dan menyejajarkannya berdasarkan urutan).
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_googlemaps
+"""
+import os
+import re
+import timeit
+
+from scrapers.googlemaps import parse_local_results
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+# Fixture -> (awal, akhir) rentang blok listing yang diulang saat diperbesar
+LAYOUTS = {
+    "googlemaps_lcl.html": ('<div jscontroller="AtSb"', '<div class="yOHZke">'),
+    "googlemaps_lcl_basic.html": ("<!--listings-->", "<!--/listings-->"),
+}
+
+
+def legacy_parse(html):
+    """Logika lama GoogleMapsScraper.get_data (dua regex non-anchored atas seluruh halaman)"""
+    business_names = re.findall(r'div class=".*?"><span>(.*?)</span></div>', html)
+    ratings = re.findall(r'<span>(\d[,\.]\d)</span>.*?<span>\(', html)
+    return list(zip(business_names, ratings))
+
+
+def scaled_page(html, factor, start_marker=LAYOUTS["googlemaps_lcl.html"][0], end_marker=LAYOUTS["googlemaps_lcl.html"][1]):
+    """Memperbesar halaman dengan mengulang blok listing (small/typical/huge)"""
+    start = html.index(start_marker)
+    end = html.index(end_marker)
+    return html[:start] + html[start:end] * factor + html[end:]
+
+
+def main():
+    print(f"{'fixture':<26} {'size':<8} {'bytes':>9} {'legacy n':>9} {'parser n':>9} {'legacy ms':>10} {'parser ms':>10}")
+    for name, (start_marker, end_marker) in LAYOUTS.items():
+        with open(os.path.join(FIXTURES, name), "r", encoding="utf-8") as f:
+            base_html = f.read()
+        for label, factor in (("small", 1), ("typical", 5), ("huge", 50)):
+            html = scaled_page(base_html, factor, start_marker, end_marker)
+            runs = 20 if factor < 50 else 5
+            legacy = min(timeit.repeat(lambda: legacy_parse(html), number=runs, repeat=3)) / runs
+            parser = min(timeit.repeat(lambda: parse_local_results(html), number=runs, repeat=3)) / runs
+            legacy_n = len(legacy_parse(html))
+            parser_n = len(parse_local_results(html))
+            print(f"{name:<26} {label:<8} {len(html):>9} {legacy_n:>9} {parser_n:>9} {legacy * 1000:>10.3f} {parser * 1000:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
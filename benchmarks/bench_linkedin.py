@@ -0,0 +1,71 @@
+"""
+Benchmark parsing halaman LinkedIn (pencarian dan detail lowongan) dari fixture HTML tersimpan.
+
+Membandingkan logika lama (tree BeautifulSoup html.parser penuh per halaman) dengan
+parse_search_results/parse_job_detail pada setiap backend yang terpasang
+(selectolax, lxml, html.parser dengan SoupStrainer).
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_linkedin
+"""
+import os
+import timeit
+
+from bs4 import BeautifulSoup
+
+from benchmarks.bench_parsers import repeat_between
+from scrapers.linkedin import parse_card, parse_search_results, parse_job_detail
+from utils.html_parser import available_backends
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+SCRAPED_AT = "2024-06-15 12:00:00"
+
+
+def legacy_search(html):
+    """Logika lama _fetch_search_page + _parse_card"""
+    return [parse_card(card, "data analyst", SCRAPED_AT) for card in BeautifulSoup(html, 'html.parser').find_all('li')]
+
+
+def legacy_detail(html):
+    """Logika lama _get_deep_detail (tanpa field turunan)"""
+    s = BeautifulSoup(html, 'html.parser')
+    desc_div = s.find('div', class_='description__text')
+    criteria = {}
+    for it in s.find_all('li', class_='description__job-criteria-item'):
+        criteria[it.find('h3').text.strip() if it.find('h3') else "Other"] = it.find('span').text.strip() if it.find('span') else "N/A"
+    return desc_div.get_text(separator="\n").strip() if desc_div else "N/A", criteria
+
+
+def _read(name):
+    with open(os.path.join(FIXTURES, name), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _time(fn, runs):
+    return min(timeit.repeat(fn, number=runs, repeat=3)) / runs * 1000
+
+
+def main():
+    pages = {
+        "search": (_read("linkedin_search.html"), "<!--cards-->", "<!--/cards-->"),
+        "detail": (_read("linkedin_detail.html"), "<!--desc-->", "<!--/desc-->"),
+    }
+    backends = available_backends()
+
+    header = f"{'page':<8} {'size':<8} {'bytes':>8} {'legacy ms':>10}" + "".join(f" {b + ' ms':>16}" for b in backends)
+    print(header)
+    for page, (base, start, end) in pages.items():
+        for label, factor in (("small", 1), ("typical", 5), ("huge", 20)):
+            html = repeat_between(base, start, end, factor)
+            runs = 20 if factor < 20 else 5
+            if page == "search":
+                legacy = _time(lambda: legacy_search(html), runs)
+                timings = [_time(lambda: parse_search_results(html, "data analyst", SCRAPED_AT, b), runs) for b in backends]
+            else:
+                legacy = _time(lambda: legacy_detail(html), runs)
+                timings = [_time(lambda: parse_job_detail(html, b), runs) for b in backends]
+            print(f"{page:<8} {label:<8} {len(html):>8} {legacy:>10.3f}" + "".join(f" {t:>16.3f}" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+Micro-benchmark langkah transform murni setiap scraper (tanpa network) atas fixture tersimpan.
+
+Setiap case dijalankan pada payload small/typical/huge (fixture diperbesar x1/x5/x50) dan
+melaporkan ops/s, latensi p50/p99 dan peak memory (tracemalloc). Hasil ditulis sebagai JSON
+agar bisa dibandingkan antar commit:
+
+    python -m benchmarks.bench_parsers
+    python -m benchmarks.bench_parsers --only tiktok,tiktok_soup --out /tmp/new.json
+    python -m benchmarks.bench_parsers --baseline .cache/bench/parsers-<commit>.json
+
+Dengan --baseline, case yang p50-nya lebih lambat dari --threshold (default 1.25x) ditandai
+dan proses keluar dengan kode 1.
+"""
+import argparse
+import copy
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from benchmarks.bench_googlemaps import LAYOUTS as GOOGLEMAPS_LAYOUTS, scaled_page
+from utils.disk_cache import CACHE_DIR
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+SIZES = (("small", 1), ("typical", 5), ("huge", 50))
+SCRAPED_AT = "2024-06-15 12:00:00"
+
+
+def _read(name):
+    with open(os.path.join(FIXTURES, name), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def repeat_between(text, start_marker, end_marker, factor):
+    """Mengulang isi di antara dua marker sebanyak `factor` kali"""
+    start = text.index(start_marker) + len(start_marker)
+    end = text.index(end_marker)
+    return text[:start] + text[start:end] * factor + text[end:]
+
+
+def _replicate(items, factor, renumber):
+    out = []
+    for n in range(factor):
+        for item in items:
+            clone = copy.deepcopy(item)
+            renumber(clone, n)
+            out.append(clone)
+    return out
+
+
+# --- payload per case (dibangun sekali per ukuran) ---
+def instagram_payload(factor):
+    payload = json.loads(_read("instagram_web_profile_info.json"))
+    timeline = payload["data"]["user"]["edge_owner_to_timeline_media"]
+
+    def renumber(edge, n):
+        edge["node"]["shortcode"] += str(n)
+    timeline["edges"] = _replicate(timeline["edges"], factor, renumber)
+    return json.dumps(payload)
+
+
+def tiktok_payload(factor):
+    # Scraper menerima resp.content (bytes)
+    return repeat_between(_read("tiktok_profile.html"), "<!--items-->", "<!--/items-->", factor).encode("utf-8")
+
+
+def shopee_payload(factor):
+    payload = json.loads(_read("shopee_items.json"))
+
+    def renumber(item, n):
+        item["item_basic"]["itemid"] += n * 1000
+    payload["items"] = _replicate(payload["items"], factor, renumber)
+    return json.dumps(payload)
+
+
+def playstore_payload(factor):
+    rows = json.loads(_read("playstore_reviews.json"))
+
+    def renumber(review, n):
+        review["reviewId"] += f"-{n}"
+    rows = _replicate(rows, factor, renumber)
+    # google-play-scraper mengembalikan datetime, bukan string
+    for r in rows:
+        for key in ("at", "repliedAt"):
+            if r.get(key):
+                r[key] = datetime.strptime(r[key], "%Y-%m-%d %H:%M:%S")
+    return rows
+
+
+# --- transform yang diukur ---
+def run_instagram(raw):
+    from scrapers.instagram import build_hybrid_result
+    user = json.loads(raw)["data"]["user"]
+    edges = user["edge_owner_to_timeline_media"]["edges"]
+    return build_hybrid_result(user, "contoh.brand", SCRAPED_AT, edges, max_posts=len(edges))["posts"]
+
+
+def run_tiktok(content):
+    from scrapers.tiktok import parse_rehydration_profile
+    return [parse_rehydration_profile(content)]
+
+
+def run_tiktok_soup(content):
+    """Jalur fallback BeautifulSoup, sebagai pembanding fast path"""
+    from scrapers.tiktok import soup_rehydration_json
+    return [soup_rehydration_json(content)]
+
+
+def run_linkedin_search(html):
+    from scrapers.linkedin import parse_search_results
+    return [item for item in parse_search_results(html, "data analyst", SCRAPED_AT) if item]
+
+
+def run_linkedin_detail(html):
+    from scrapers.linkedin import parse_job_detail
+    return [parse_job_detail(html)]
+
+
+def run_googlemaps(html):
+    from scrapers.googlemaps import parse_local_results, listing_to_post
+    return [listing_to_post(listing, SCRAPED_AT) for listing in parse_local_results(html)]
+
+
+def run_shopee(raw):
+    from scrapers.shopee import build_shop_result
+    payload = json.loads(raw)
+    return build_shop_result(payload["shop"], payload["shop"]["shopid"], payload["items"], len(payload["items"]), SCRAPED_AT)["posts"]
+
+
+def run_playstore(rows):
+    from scrapers.playstore import review_to_post
+    return [review_to_post(r, "Contoh App", SCRAPED_AT) for r in rows]
+
+
+CASES = {
+    "instagram": (instagram_payload, run_instagram),
+    "tiktok": (tiktok_payload, run_tiktok),
+    "tiktok_soup": (tiktok_payload, run_tiktok_soup),
+    "linkedin_search": (lambda f: repeat_between(_read("linkedin_search.html"), "<!--cards-->", "<!--/cards-->", f), run_linkedin_search),
+    "linkedin_detail": (lambda f: repeat_between(_read("linkedin_detail.html"), "<!--desc-->", "<!--/desc-->", f), run_linkedin_detail),
+    "googlemaps": (lambda f: scaled_page(_read("googlemaps_lcl.html"), f), run_googlemaps),
+    "googlemaps_basic": (lambda f: scaled_page(_read("googlemaps_lcl_basic.html"), f, *GOOGLEMAPS_LAYOUTS["googlemaps_lcl_basic.html"]), run_googlemaps),
+    "shopee": (shopee_payload, run_shopee),
+    "playstore": (playstore_payload, run_playstore),
+}
+
+
+def payload_bytes(payload):
+    if isinstance(payload, bytes):
+        return len(payload)
+    if isinstance(payload, str):
+        return len(payload.encode("utf-8"))
+    return len(json.dumps(payload, default=str).encode("utf-8"))
+
+
+def measure(fn, payload, min_time=0.5, min_runs=5):
+    """Latensi per panggilan (detik) sampai min_time terlampaui, lalu peak memory satu panggilan"""
+    fn(payload)  # warmup (import, cache regex)
+    latencies = []
+    started = time.perf_counter()
+    while len(latencies) < min_runs or time.perf_counter() - started < min_time:
+        t0 = time.perf_counter()
+        result = fn(payload)
+        latencies.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    fn(payload)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "runs": len(latencies),
+        "items": len(result),
+        "ops_per_s": round(len(latencies) / sum(latencies), 2),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 4),
+        "p99_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000, 4),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results, baseline_path, threshold):
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {(r["case"], r["size"]): r for r in json.load(f)["results"]}
+    regressions = []
+    for r in results:
+        old = baseline.get((r["case"], r["size"]))
+        if old and old["p50_ms"] > 0 and r["p50_ms"] / old["p50_ms"] > threshold:
+            regressions.append((r["case"], r["size"], old["p50_ms"], r["p50_ms"]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", help="daftar case dipisah koma (default semua)")
+    parser.add_argument("--min-time", type=float, default=0.5, help="detik minimum per case/ukuran")
+    parser.add_argument("--out", help="file JSON hasil (default .cache/bench/parsers-<commit>.json)")
+    parser.add_argument("--baseline", help="file JSON hasil commit lain untuk dibandingkan")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_args()
+
+    names = args.only.split(",") if args.only else list(CASES)
+    unknown = [n for n in names if n not in CASES]
+    if unknown:
+        parser.error(f"case tidak dikenal: {', '.join(unknown)} (pilihan: {', '.join(CASES)})")
+
+    results = []
+    print(f"{'case':<16} {'size':<8} {'bytes':>9} {'items':>6} {'ops/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'peak KB':>9}")
+    for name in names:
+        build, fn = CASES[name]
+        for size, factor in SIZES:
+            payload = build(factor)
+            row = {"case": name, "size": size, "bytes": payload_bytes(payload), **measure(fn, payload, args.min_time)}
+            results.append(row)
+            print(f"{name:<16} {size:<8} {row['bytes']:>9} {row['items']:>6} {row['ops_per_s']:>10.1f} {row['p50_ms']:>9.3f} {row['p99_ms']:>9.3f} {row['peak_kb']:>9.1f}")
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    out = args.out or os.path.join(CACHE_DIR, "bench", f"parsers-{commit}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nHasil ditulis ke {out}")
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.threshold)
+        for case, size, old, new in regressions:
+            print(f"REGRESI {case}/{size}: p50 {old:.3f} ms -> {new:.3f} ms")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Profil waktu import (python -X importtime) untuk cold-start Streamlit dan tiap platform.
+
+Tanpa argumen, mengukur import yang dijalankan app.py saat start (dibaca dari app.py),
+lalu biaya tambahan saat sebuah platform dipilih: modul scraper dan dashboard dari
+scrapers.registry, di atas modul app yang sudah terimpor. Setiap pengukuran berjalan di
+proses baru agar tidak ada modul yang sudah ter-cache.
+
+    python -m benchmarks.import_profile
+    python -m benchmarks.import_profile --platform TikTok --top 25
+    python -m benchmarks.import_profile scrapers.googlenews --preload "" --out /tmp/imp.json
+"""
+import argparse
+import ast
+import json
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "app.py")
+_MARKER = "--- import_profile target ---"
+_LINE_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def app_imports(path=APP):
+    """Modul yang diimpor di level atas app.py (urutan sesuai file)"""
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def _run(modules, preload):
+    """Satu proses baru: impor preload, tulis marker, lalu impor modules; kembalikan baris importtime milik modules"""
+    code = "".join(f"import {m}\n" for m in preload)
+    code += f"import sys\nsys.stderr.write({_MARKER!r} + '\\n')\nsys.stderr.flush()\n"
+    code += "".join(f"import {m}\n" for m in modules)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import gagal")
+    rows = []
+    for line in proc.stderr.split(_MARKER, 1)[-1].splitlines():
+        m = _LINE_RE.match(line)
+        if m:
+            rows.append({"module": m.group(4), "self_us": int(m.group(1)), "cumulative_us": int(m.group(2)), "depth": (len(m.group(3)) - 1) // 2})
+    return rows
+
+
+def profile(modules, preload=(), repeat=3):
+    """
+    Mengukur `repeat` kali dan mengambil waktu self minimum per modul (seperti timeit).
+    Mengembalikan total (ms), rincian per modul dan per paket level atas.
+    """
+    best = {}
+    for _ in range(repeat):
+        for row in _run(modules, preload):
+            old = best.get(row["module"])
+            if old is None or row["self_us"] < old["self_us"]:
+                best[row["module"]] = row
+
+    packages = {}
+    for row in best.values():
+        top = row["module"].split(".")[0]
+        packages[top] = packages.get(top, 0) + row["self_us"]
+
+    return {
+        "modules": list(modules),
+        "preload": list(preload),
+        "total_ms": round(sum(r["self_us"] for r in best.values()) / 1000, 2),
+        "module_count": len(best),
+        "by_module": sorted(({"module": r["module"], "self_ms": round(r["self_us"] / 1000, 3)} for r in best.values()), key=lambda r: -r["self_ms"]),
+        "by_package": sorted(({"package": p, "self_ms": round(us / 1000, 3)} for p, us in packages.items()), key=lambda r: -r["self_ms"]),
+    }
+
+
+def platform_modules(platform):
+    from scrapers.registry import get_spec
+    spec = get_spec(platform)
+    return [path.split(":")[0] for path in (spec.scraper_path, spec.dashboard_path) if path]
+
+
+def _print_detail(label, report, top):
+    print(f"\n{label}: {report['total_ms']:.1f} ms, {report['module_count']} modul")
+    print(f"  {'paket':<32} {'self ms':>9}")
+    for row in report["by_package"][:top]:
+        print(f"  {row['package']:<32} {row['self_ms']:>9.2f}")
+    print(f"  {'modul':<48} {'self ms':>9}")
+    for row in report["by_module"][:top]:
+        print(f"  {row['module']:<48} {row['self_ms']:>9.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", help="modul yang diprofil (default: import level atas app.py)")
+    parser.add_argument("--preload", help="modul dipisah koma yang diimpor dulu dan tidak dihitung (default: kosong untuk modul app, import app.py untuk platform)")
+    parser.add_argument("--platform", action="append", help="hanya platform ini (boleh diulang; default semua)")
+    parser.add_argument("--top", type=int, default=10, help="jumlah baris per rincian")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", help="tulis laporan JSON ke file ini")
+    args = parser.parse_args()
+
+    from scrapers.registry import platforms, resolve_platform
+
+    base = app_imports()
+    reports = {}
+    if args.modules:
+        preload = [m for m in (args.preload or "").split(",") if m]
+        reports["custom"] = profile(args.modules, preload, args.repeat)
+        _print_detail(", ".join(args.modules), reports["custom"], args.top)
+    else:
+        reports["app"] = profile(base, repeat=args.repeat)
+        _print_detail("Cold-start app.py", reports["app"], args.top)
+
+        selected = [resolve_platform(p) for p in args.platform] if args.platform else platforms()
+        if None in selected:
+            parser.error(f"platform tidak dikenal, pilihan: {', '.join(platforms())}")
+        preload = [m for m in args.preload.split(",") if m] if args.preload is not None else base
+        print(f"\n{'platform':<12} {'tambahan ms':>12} {'modul':>6}  paket terberat")
+        for name in selected:
+            report = profile(platform_modules(name), preload, args.repeat)
+            reports[name] = report
+            heaviest = ", ".join(f"{r['package']} {r['self_ms']:.0f}" for r in report["by_package"][:3])
+            print(f"{name:<12} {report['total_ms']:>12.1f} {report['module_count']:>6}  {heaviest}")
+        if args.platform:
+            for name in selected:
+                _print_detail(f"Platform {name}", reports[name], args.top)
+
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "reports": reports}, f, indent=2)
+        print(f"\nHasil ditulis ke {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,51 @@
 from abc import ABC, abstractmethod
 
+# Profil kolom lintas scraper:
+# - "fast" : lewati semua enrichment yang butuh request tambahan per item
+# - "full" : semua kolom termasuk enrichment mahal (perilaku default)
+FIELD_PROFILES = ("fast", "full")
+DEFAULT_FIELDS = "full"
+
+def merge_posts_by_url(results):
+    """
+    Menggabungkan posts dari beberapa hasil keyword menjadi satu record per URL.
+
+    Urutan mengikuti kemunculan pertama; kolom `keywords` berisi semua keyword yang cocok.
+    """
+    merged = {}
+    for res in results:
+        keyword = res.get("profile_info", {}).get("username")
+        for post in res.get("posts", []):
+            key = post.get("url") or id(post)
+            if key not in merged:
+                merged[key] = {**post, "keywords": []}
+            if keyword and keyword not in merged[key]["keywords"]:
+                merged[key]["keywords"].append(keyword)
+    return list(merged.values())
+
+# Opsi seragam untuk BaseScraper.scrape; tiap scraper hanya membaca yang relevan
+DEFAULT_OPTIONS = {
+    "max_posts": 10,
+    "since_date": None,
+    "fields": DEFAULT_FIELDS,  # Instagram Deep (lokasi/tag per post) & LinkedIn (halaman detail); platform lain mengabaikan
+    "method": "hybrid",       # Instagram: "hybrid" (httpx) atau "deep" (Instaloader)
+    "incremental": False,     # PlayStore: sync ulasan baru saja
+    "slice_days": None,       # GoogleNews/GoogleJobs: ukuran jendela waktu
+}
+# Opsi "on_post" (callable, tidak berasal dari input pengguna): sink per post untuk streaming.
+# Scraper yang mendukungnya (PlayStore, Instagram Hybrid, TikTok) memanggil on_post(post) begitu
+# post diproduksi dan tidak menyimpannya di hasil ("posts" kosong); scraper lain mengabaikannya.
+
+def scrape_options(options=None):
+    """Melengkapi opsi dengan DEFAULT_OPTIONS"""
+    return {**DEFAULT_OPTIONS, **{k: v for k, v in (options or {}).items() if v is not None}}
+
 class BaseScraper(ABC):
     @abstractmethod
-    def get_data(self, identifier: str):
-        """Method utama untuk mengambil data"""
-        pass
\ No newline at end of file
+    def scrape(self, target: str, options: dict):
+        """Entry point seragam: satu target -> dict hasil (profile_info/posts atau error)"""
+        pass
+
+    def batch_workers(self, options):
+        """Batas worker paralel untuk batch target dengan opsi ini (None = ikuti utils.batch)"""
+        return None
\ No newline at end of file
@@ -0,0 +1,74 @@
+import threading
+from abc import abstractmethod
+from gnews import GNews
+from datetime import date, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from scrapers.base import merge_posts_by_url, BaseScraper, scrape_options
+from utils.timeslice import date_windows, fetch_windows, as_gnews_date
+
+# Batas query Google News yang berjalan bersamaan di seluruh proses. get_data_many
+# (paralel per keyword) x fetch_windows (paralel per jendela) bisa membuka puluhan
+# thread; semuanya antre di semaphore yang sama, dipakai bersama GoogleNews & GoogleJobs.
+MAX_CONCURRENT_QUERIES = 6
+_query_slots = threading.BoundedSemaphore(MAX_CONCURRENT_QUERIES)
+
+
+class GNewsScraperBase(BaseScraper):
+    """Bagian bersama GoogleNews & GoogleJobs: client GNews, query per jendela waktu, gabung keyword"""
+    PLATFORM = None
+    CATEGORY = None
+    # Rentang default (hari) saat query dipecah per jendela waktu tanpa since_date
+    DEFAULT_RANGE_DAYS = 30
+
+    def __init__(self, language='id', country='ID', period=None):
+        self.language = language
+        self.country = country
+        self.period = period
+
+    def _new_client(self, max_posts, start_date=None, end_date=None):
+        # Objek GNews dibuat per panggilan agar aman dipakai paralel (tidak ada state bersama)
+        if start_date and end_date:
+            # start/end date menggantikan period
+            return GNews(language=self.language, country=self.country, max_results=max_posts,
+                         start_date=as_gnews_date(start_date), end_date=as_gnews_date(end_date))
+        return GNews(language=self.language, country=self.country, period=self.period, max_results=max_posts)
+
+    @staticmethod
+    def _query(client, encoded_keyword):
+        with _query_slots:
+            return client.get_news(encoded_keyword)
+
+    def _get_news(self, encoded_keyword, max_posts, since_date=None, slice_days=None):
+        if not slice_days:
+            return self._query(self._new_client(max_posts), encoded_keyword)
+
+        # Query dipecah per jendela waktu dan dijalankan paralel agar tidak mentok di batas hasil per query
+        end = date.today() + timedelta(days=1)
+        start = since_date or end - timedelta(days=self.DEFAULT_RANGE_DAYS)
+        windows = date_windows(start, end, slice_days)
+        articles = fetch_windows(
+            lambda s, e: self._query(self._new_client(max_posts, s, e), encoded_keyword), windows
+        )
+        return articles[:max_posts]
+
+    @abstractmethod
+    def get_data(self, keyword, max_posts=10, since_date=None, slice_days=None):
+        """Satu keyword -> dict hasil platform"""
+
+    def get_data_many(self, keywords, max_posts=10, max_workers=6, since_date=None, slice_days=None):
+        """Fetch banyak keyword secara paralel lalu gabungkan artikel yang sama (berdasarkan URL)"""
+        keywords = [k.strip() for k in keywords if k and k.strip()]
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(keywords)))) as pool:
+            results = list(pool.map(lambda k: self.get_data(k, max_posts=max_posts, since_date=since_date, slice_days=slice_days), keywords))
+
+        errors = [r["error"] for r in results if r.get("error")]
+        return {
+            "platform": self.PLATFORM,
+            "profile_info": {"username": ", ".join(keywords), "category": self.CATEGORY, "keywords": keywords, "followers": 0},
+            "posts": merge_posts_by_url(results),
+            "metadata": {"keywords": len(keywords), "failed_keywords": len(errors)}
+        }
+
+    def scrape(self, target, options):
+        o = scrape_options(options)
+        return self.get_data(target, max_posts=o["max_posts"], since_date=o["since_date"], slice_days=o["slice_days"])
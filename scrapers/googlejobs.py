@@ -1,14 +1,17 @@
-from gnews import GNews
 from datetime import datetime
 import urllib.parse
+from scrapers.gnews_base import GNewsScraperBase
 
-class GoogleJobsScraper:
-    def __init__(self):
+class GoogleJobsScraper(GNewsScraperBase):
+    PLATFORM = "GoogleJobs"
+    CATEGORY = "Talent Intelligence"
+    DEFAULT_RANGE_DAYS = 7
+
+    def __init__(self, language='id', country='ID', period='7d'):
         # Menggunakan setting yang sama dengan GNews Anda yang stabil
-        self.gn = GNews(language='id', country='ID', period='7d')
-        self.gn.full_article = True 
+        super().__init__(language, country, period)
 
-    def get_data(self, keyword, max_posts=10):
+    def get_data(self, keyword, max_posts=10, since_date=None, slice_days=None):
         scraped_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
         # Mengoptimasi keyword agar yang muncul adalah lowongan kerja
@@ -16,10 +19,8 @@ class GoogleJobsScraper:
         job_keyword = f"{keyword.strip()} lowongan kerja"
         encoded_keyword = urllib.parse.quote(job_keyword)
         
-        self.gn.max_results = max_posts
-        
         try:
-            results = self.gn.get_news(encoded_keyword)
+            results = self._get_news(encoded_keyword, max_posts, since_date, slice_days)
             
             data = {
                 "platform": "GoogleJobs",
@@ -58,4 +59,4 @@ class GoogleJobsScraper:
                 "error": str(e),
                 "profile_info": {"username": keyword, "followers": 0},
                 "posts": []
-            }
\ No newline at end of file
+            }
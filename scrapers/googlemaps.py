@@ -1,14 +1,177 @@
-import httpx
 from datetime import datetime
+import html
+from urllib.parse import quote_plus
+from utils.http import build_client
 import re
+from scrapers.base import BaseScraper, scrape_options
 
-class GoogleMapsScraper:
-    def __init__(self):
+# Penanda container satu listing pada halaman tbm=lcl (layout JS, non-JS & dasar), dicari dengan
+# str.find: regex \b(?:A|B)\b tanpa prefix literal memindai halaman ~10x lebih lambat
+LISTING_MARKERS = ("VkpGBb", "uMdZh", "X7NTVe")
+CID_MARKERS = ('data-cid="',)
+# Batas panjang satu blok listing (listing terakhir tidak memotong sisa halaman)
+MAX_BLOCK = 8000
+
+HEADING_RE = re.compile(r'role="heading"[^>]*>(.*?)</div>', re.S)
+NAME_CLASS_RE = re.compile(r'class="[^"]*\b(?:OSrXXb|dbg0pd|q5WnMd)\b[^"]*"[^>]*>(.*?)</(?:span|div)>', re.S)
+RATING_TAG_RE = re.compile(r'>(\d[,.]\d)<')
+REVIEWS_TAG_RE = re.compile(r'>\(([\d.,]+\s*(?:rb|jt|k|K)?)\)<')
+CID_RE = re.compile(r'data-cid="(\d+)"')
+HREF_RE = re.compile(r'href="([^"]+)"')
+TEXT_NODE_RE = re.compile(r'>([^<]+)<')
+TAG_RE = re.compile(r'<[^>]+>')
+
+# Halaman tanpa container listing yang dikenal: regex lama sebagai upaya terakhir
+LEGACY_NAME_RE = re.compile(r'div class=".*?"><span>(.*?)</span></div>')
+LEGACY_RATING_RE = re.compile(r'<span>(\d[,\.]\d)</span>.*?<span>\(')
+
+RATING_RE = re.compile(r"^\d[,.]\d$")
+REVIEWS_RE = re.compile(r"^\(([\d.,]+\s*(?:rb|jt|k|K)?)\)$")
+
+# Filter Kata Sampah agar tidak muncul "Rute" sebagai Nama Toko
+BLACKLIST = {"Rute", "Situs", "Telepon", "Panggil", "Simpan", "Bagikan", "Website"}
+
+
+def _parse_block(block):
+    """Satu blok HTML listing -> dict listing (nama, rating, ulasan, baris detail, link)"""
+    name_match = HEADING_RE.search(block) or NAME_CLASS_RE.search(block)
+    if not name_match:
+        return None
+    name = html.unescape(TAG_RE.sub("", name_match.group(1))).strip()
+
+    rating_match = RATING_TAG_RE.search(block)
+    reviews_match = REVIEWS_TAG_RE.search(block)
+    cid_match = CID_RE.search(block)
+    href_match = HREF_RE.search(block)
+
+    # Text node setelah nama: rating, ulasan, kategori, alamat, jam buka (berurutan);
+    # html.unescape hanya untuk teks yang memang berisi entity
+    details = [(html.unescape(t) if "&" in t else t).strip(" ·") for t in TEXT_NODE_RE.findall(block, name_match.end())]
+
+    return {
+        "name": name,
+        "rating": float(rating_match.group(1).replace(",", ".")) if rating_match else None,
+        "reviews": reviews_match.group(1) if reviews_match else None,
+        "details": [d for d in details if d],
+        "link": html.unescape(href_match.group(1)) if href_match else None,
+        "cid": cid_match.group(1) if cid_match else None,
+    }
+
+
+def _find_markers(page, tokens):
+    """Posisi token yang tidak menempel pada huruf/angka lain (seperti \\b di regex), terurut"""
+    positions = []
+    for token in tokens:
+        check_end = token[-1].isalnum()
+        pos = page.find(token)
+        while pos != -1:
+            end = pos + len(token)
+            if not page[pos - 1:pos].isalnum() and not (check_end and page[end:end + 1].isalnum()):
+                positions.append(pos)
+            pos = page.find(token, end)
+    return sorted(positions)
+
+
+def _parse_legacy(page):
+    """
+    Fallback halaman tanpa container listing yang dikenal: regex nama/rating lama.
+    Rating dipasangkan dengan nama berdasarkan posisi di halaman (rating pertama di antara
+    nama ini dan nama berikutnya), bukan berdasarkan urutan, agar listing tanpa rating
+    tidak menggeser rating listing sesudahnya.
+    """
+    names = list(LEGACY_NAME_RE.finditer(page))
+    rating_matches = list(LEGACY_RATING_RE.finditer(page))
+    listings = []
+    r = 0
+    for i, match in enumerate(names):
+        next_start = names[i + 1].start() if i + 1 < len(names) else len(page)
+        while r < len(rating_matches) and rating_matches[r].start() < match.end():
+            r += 1
+        rating = None
+        if r < len(rating_matches) and rating_matches[r].start() < next_start:
+            rating = rating_matches[r].group(1)
+        name = html.unescape(TAG_RE.sub("", match.group(1))).strip()
+        if not name or name in BLACKLIST or len(name) <= 1:
+            continue
+        listings.append({
+            "name": name,
+            "rating": float(rating.replace(",", ".")) if rating else None,
+            "reviews": None,
+            "details": [],
+            "link": None,
+            "cid": None,
+        })
+    return listings
+
+
+def parse_local_results(page):
+    """
+    Parser satu kali jalan untuk halaman tbm=lcl.
+
+    Halaman dipotong per container listing, lalu setiap listing diambil sebagai satu unit
+    (nama, rating, jumlah ulasan, kategori, alamat, link) sehingga rating tidak tertukar
+    jika ada listing tanpa rating. Semua regex hanya bekerja di dalam satu blok.
+    Hanya jika tidak ada listing yang ditemukan per blok, halaman ditangani _parse_legacy.
+    """
+    # Posisi awal tag yang membawa penanda listing
+    markers = _find_markers(page, LISTING_MARKERS) or _find_markers(page, CID_MARKERS)
+    starts = [page.rfind("<", 0, pos) for pos in markers]
+    listings = []
+    for i, start in enumerate(starts):
+        end = starts[i + 1] if i + 1 < len(starts) else len(page)
+        listing = _parse_block(page[start:min(end, start + MAX_BLOCK)])
+        if listing and listing["name"] not in BLACKLIST and len(listing["name"]) > 1:
+            listings.append(listing)
+    return listings or _parse_legacy(page)
+
+
+def _split_details(details):
+    """Baris detail: '4,5(120) · Restoran cepat saji' lalu 'Jl. ...' -> (kategori, alamat)"""
+    category, address = "Local Business", "Lokasi Tertera di Peta"
+    parts = [p.strip() for line in details for p in line.split("·") if p.strip()]
+    parts = [p for p in parts if not RATING_RE.match(p) and not REVIEWS_RE.match(p) and not re.match(r"^\d[,.]\d\s*\(", p)]
+    if parts:
+        category = parts[0]
+    if len(parts) > 1:
+        address = parts[1]
+    return category, address
+
+
+def listing_to_post(listing, scraped_at):
+    name = listing["name"]
+    rating = listing["rating"] if listing["rating"] is not None else 0.0
+    category, address = _split_details(listing["details"])
+    if listing["cid"]:
+        url = f"https://maps.google.com/?cid={listing['cid']}"
+    elif listing["link"] and listing["link"].startswith(("http", "/")):
+        url = listing["link"] if listing["link"].startswith("http") else f"https://www.google.com{listing['link']}"
+    else:
+        url = f"https://www.google.com/search?q={quote_plus(name)}"
+    return {
+        "name": name,
+        "rating": rating,
+        "reviews_count": listing["reviews"] or "0",
+        "category": category,
+        "address": address,
+        "url": url,
+        "scraped_at": scraped_at,
+        "date": scraped_at, # Wajib untuk app.py
+        "caption": f"Bisnis: {name} (Rating: {rating})",
+        "likes": 0
+    }
+
+
+class GoogleMapsScraper(BaseScraper):
+    # Jumlah listing per halaman tbm=lcl (parameter start)
+    PAGE_SIZE = 20
+
+    def __init__(self, http2=False, pool_limits=None):
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             "Accept-Language": "id-ID,id;q=0.9,en-US;q=0.8,en;q=0.7",
             "Referer": "https://www.google.com/"
         }
+        self.client = build_client(headers=self.headers, timeout=20.0, http2=http2, pool_limits=pool_limits, cache="GoogleMaps")
 
     def get_data(self, keyword, max_posts=15):
         scraped_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -27,46 +190,34 @@ class GoogleMapsScraper:
         }
 
         try:
-            with httpx.Client(headers=self.headers, timeout=20.0, follow_redirects=True) as client:
-                response = client.get(search_url)
+            seen = set()
+            start = 0
+            # Paging lewat parameter start sampai max_posts atau tidak ada listing baru
+            while len(result_template["posts"]) < max_posts:
+                response = self.client.get(search_url, params={"start": start} if start else None)
                 if response.status_code != 200:
-                    return {"error": f"Google Status {response.status_code}", "platform": "GoogleMaps", "profile_info": {"username": keyword}, "posts": []}
-
-                html = response.text
-                
-                # Gunakan regex persis seperti di test.py Anda
-                business_names = re.findall(r'div class=".*?"><span>(.*?)</span></div>', html)
-                ratings = re.findall(r'<span>(\d[,\.]\d)</span>.*?<span>\(', html)
-
-                # Filter Kata Sampah agar tidak muncul "Rute" sebagai Nama Toko
-                blacklist = ["Rute", "Situs", "Telepon", "Panggil", "Simpan", "Bagikan", "Website"]
-
-                count = 0
-                for i in range(len(business_names)):
-                    if count >= max_posts: break
-                    
-                    name = re.sub(r'<.*?>', '', business_names[i]).strip()
-                    
-                    # VALIDASI: Hanya ambil jika bukan kata sampah dan bukan string kosong
-                    if name and name not in blacklist and len(name) > 1:
-                        rating = ratings[count] if count < len(ratings) else "0.0"
-                        
-                        item = {
-                            "name": name,
-                            "rating": float(rating.replace(',', '.')),
-                            "reviews_count": "Cek Google",
-                            "category": "Local Business",
-                            "address": "Lokasi Tertera di Peta",
-                            "url": f"https://www.google.com/search?q={name.replace(' ', '+')}",
-                            "scraped_at": scraped_at,
-                            "date": scraped_at, # Wajib untuk app.py
-                            "caption": f"Bisnis: {name} (Rating: {rating})",
-                            "likes": 0
-                        }
-                        result_template["posts"].append(item)
-                        count += 1
-
-                return result_template
+                    if start == 0:
+                        return {"error": f"Google Status {response.status_code}", "platform": "GoogleMaps", "profile_info": {"username": keyword}, "posts": []}
+                    break
+
+                new_items = 0
+                for listing in parse_local_results(response.text):
+                    if len(result_template["posts"]) >= max_posts: break
+                    key = (listing["name"], listing["cid"] or tuple(listing["details"]))
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    result_template["posts"].append(listing_to_post(listing, scraped_at))
+                    new_items += 1
+
+                if not new_items:
+                    break
+                start += self.PAGE_SIZE
+
+            return result_template
 
         except Exception as e:
-            return {"error": str(e), "platform": "GoogleMaps", "profile_info": {"username": keyword}, "posts": []}
\ No newline at end of file
+            return {"error": str(e), "platform": "GoogleMaps", "profile_info": {"username": keyword}, "posts": []}
+
+    def scrape(self, target, options):
+        return self.get_data(target, max_posts=scrape_options(options)["max_posts"])
@@ -1,19 +1,18 @@
-from gnews import GNews
 from datetime import datetime
 import urllib.parse
+from scrapers.gnews_base import GNewsScraperBase
 
-class GoogleNewsScraper:
-    def __init__(self):
-        self.gn = GNews(language='id', country='ID')
-        self.gn.full_article = True 
+class GoogleNewsScraper(GNewsScraperBase):
+    PLATFORM = "GoogleNews"
+    CATEGORY = "News"
+    DEFAULT_RANGE_DAYS = 30
 
-    def get_data(self, keyword, max_posts=10):
+    def get_data(self, keyword, max_posts=10, since_date=None, slice_days=None):
         scraped_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         encoded_keyword = urllib.parse.quote(keyword.strip())
-        self.gn.max_results = max_posts
         
         try:
-            results = self.gn.get_news(encoded_keyword)
+            results = self._get_news(encoded_keyword, max_posts, since_date, slice_days)
             data = {
                 "platform": "GoogleNews",
                 "profile_info": {"username": keyword, "category": "News", "followers": 0},
@@ -37,4 +36,4 @@ class GoogleNewsScraper:
                 data["posts"].append(item)
             return data
         except Exception as e:
-            return {"error": str(e), "platform": "GoogleNews", "posts": []}
\ No newline at end of file
+            return {"error": str(e), "platform": "GoogleNews", "posts": []}
@@ -1,10 +1,160 @@
 import instaloader
-import httpx  
 import json
+import os
+import time
 from datetime import datetime
+from utils.http import build_client
+from utils.disk_cache import CACHE_DIR
+from utils.ratelimit import RateLimiter
+from scrapers.base import DEFAULT_FIELDS, BaseScraper, scrape_options
 
-class InstagramScraper:
-    def __init__(self):
+INSTALOADER_STATE_DIR = os.path.join(CACHE_DIR, "instaloader")
+
+
+class PersistentRateController(instaloader.RateController):
+    """RateController Instaloader yang menyimpan riwayat query ke disk agar jeda tetap dihormati antar proses"""
+
+    def __init__(self, context, path=None):
+        super().__init__(context)
+        self.path = path or os.path.join(INSTALOADER_STATE_DIR, "rate_controller.json")
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        # Timestamp disimpan sebagai wall-clock, dikonversi kembali ke skala time.monotonic()
+        offset = time.monotonic() - time.time()
+        self._query_timestamps = {q: [ts + offset for ts in stamps] for q, stamps in saved.items()}
+
+    def _save(self):
+        offset = time.time() - time.monotonic()
+        cutoff = time.monotonic() - 3600
+        saved = {q: [ts + offset for ts in stamps if ts > cutoff] for q, stamps in self._query_timestamps.items()}
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(saved, f)
+        except OSError:
+            pass
+
+    def wait_before_query(self, query_type):
+        super().wait_before_query(query_type)
+        self._save()
+
+    def handle_429(self, query_type):
+        self._save()
+        super().handle_429(query_type)
+
+
+def timeline_node_to_post(node, username, post_dt):
+    """Satu node timeline (web_profile_info/graphql) -> dict post"""
+    # Caption Extraction
+    cap = ""
+    cap_edges = node.get('edge_media_to_caption', {}).get('edges', [])
+    if cap_edges:
+        cap = cap_edges[0].get('node', {}).get('text', '')
+
+    return {
+        "username": username,
+        "date": post_dt.strftime('%Y-%m-%d %H:%M:%S'),
+        "caption": cap,
+        "likes": node.get('edge_media_preview_like', {}).get('count', 0),
+        "comments_count": node.get('edge_media_to_comment', {}).get('count', 0),
+        "url": f"https://www.instagram.com/p/{node.get('shortcode')}/",
+        "hashtags": list(set(part[1:] for part in cap.split() if part.startswith('#'))),
+        "mentions": list(set(part[1:] for part in cap.split() if part.startswith('@'))),
+        "is_video": node.get('is_video', False),
+        "typename": node.get('__typename'),
+        "video_view_count": node.get('video_view_count', 0) if node.get('is_video') else 0,
+        "location": node.get('location', {}).get('name') if node.get('location') else None,
+        "tagged_users": [t.get('node', {}).get('user', {}).get('username') for t in node.get('edge_media_to_tagged_user', {}).get('edges', [])]
+    }
+
+
+def build_hybrid_result(data_json, username, scraped_at, edges, max_posts=10, since_date=None, on_post=None):
+    """
+    Transform murni web_profile_info (`data.user`) + edge timeline -> dict hasil.
+    `edges` boleh berupa generator; iterasi berhenti di max_posts/since_date.
+    Dengan on_post, tiap post dikirim begitu edge-nya diproses dan "posts" dibiarkan kosong.
+    """
+    # 1. Profile Umum (Struktur Identik dengan get_detailed_data)
+    result = {
+        "metadata": {
+            "scraped_at": scraped_at,
+            "total_posts_on_profile": data_json.get('edge_owner_to_timeline_media', {}).get('count', 0),
+            "platform": "Instagram"
+        },
+        "profile_info": {
+            "userid": data_json.get('id'),
+            "username": data_json.get('username'),
+            "full_name": data_json.get('full_name'),
+            "bio": data_json.get('biography'),
+            "profile_pic": data_json.get('profile_pic_url'),
+            "is_business": data_json.get('is_business_account'),
+            "business_category": data_json.get('business_category_name'),
+            "external_url": data_json.get('external_url'),
+            "followers": data_json.get('edge_followed_by', {}).get('count', 0),
+            "following": data_json.get('edge_follow', {}).get('count', 0),
+            "is_verified": data_json.get('is_verified'),
+            "scraped_at": scraped_at
+        },
+        "posts": []
+    }
+
+    # 2. Postingan (Struktur Identik)
+    total_likes = 0
+    total_comments = 0
+    post_count = 0
+
+    for edge in edges:
+        if post_count >= max_posts:
+            break
+
+        node = edge.get('node', {})
+        post_dt = datetime.fromtimestamp(node.get('taken_at_timestamp', 0))
+
+        if since_date and post_dt.date() < since_date:
+            # Postingan yang di-pin bisa lebih lama walau tampil paling atas
+            if node.get('pinned_for_users'):
+                continue
+            break
+
+        post = timeline_node_to_post(node, username, post_dt)
+        total_likes += post["likes"]
+        total_comments += post["comments_count"]
+        post_count += 1
+        if on_post:
+            on_post(post)
+        else:
+            result["posts"].append(post)
+        # Berhenti sebelum menarik edge berikutnya (bisa memicu request halaman GraphQL)
+        if post_count >= max_posts:
+            break
+
+    # 3. Analytics
+    if post_count and result["profile_info"]["followers"] > 0:
+        avg_eng = (total_likes + total_comments) / post_count
+        er = (avg_eng / result["profile_info"]["followers"]) * 100
+        result["profile_info"]["engagement_rate"] = round(er, 2)
+        result["profile_info"]["avg_likes"] = round(total_likes / post_count, 1)
+    else:
+        result["profile_info"]["engagement_rate"] = 0
+        result["profile_info"]["avg_likes"] = 0
+
+    return result
+
+
+class InstagramScraper(BaseScraper):
+    # GraphQL query timeline postingan profil (format edge sama dengan web_profile_info)
+    TIMELINE_QUERY_HASH = "003056d32c2554def87228bc3fd9668a"
+    TIMELINE_PAGE_SIZE = 12
+    # Batas halaman GraphQL per profil (12 post/halaman) agar max_posts besar tidak memicu blokir
+    MAX_TIMELINE_PAGES = 50
+
+    def __init__(self, http2=False, pool_limits=None, session_user=None, timeline_requests_per_second=0.5):
         # Header dasar (akan diperbarui secara dinamis di dalam fungsi)
         self.base_headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -12,10 +162,93 @@ class InstagramScraper:
             "X-ASBD-ID": "129477",
             "X-Requested-With": "XMLHttpRequest",
         }
-        # Inisialisasi Instaloader untuk Metode Deep
-        self.L = instaloader.Instaloader(user_agent=self.base_headers["User-Agent"])
+        # Client httpx bersama (keep-alive) untuk Metode Hybrid, dipakai ulang lintas target
+        self.client = build_client(headers=self.base_headers, timeout=20.0, http2=http2, pool_limits=pool_limits, cache="Instagram")
+        # Budget halaman timeline GraphQL, dibagi semua worker yang memakai instance ini
+        self.timeline_limiter = RateLimiter(timeline_requests_per_second)
+        # Inisialisasi Instaloader untuk Metode Deep (state rate controller persisten)
+        self.L = instaloader.Instaloader(
+            user_agent=self.base_headers["User-Agent"],
+            rate_controller=lambda ctx: PersistentRateController(ctx)
+        )
+        # Session login hasil `instaloader --login` dipakai ulang jika tersedia
+        # (lokasi default instaloader, mis. ~/.config/instaloader/session-<user>)
+        self.session_user = session_user or os.environ.get("IG_SESSION_USER")
+        if self.session_user:
+            try:
+                self.L.load_session_from_file(self.session_user)
+            except (OSError, instaloader.exceptions.InstaloaderException):
+                pass
+
+    def _resume_path(self, username):
+        return os.path.join(INSTALOADER_STATE_DIR, "resume", f"{username.lower()}.json")
 
-    def get_data_hybrid(self, username, max_posts=10, since_date=None):
+    def _load_resume(self, username, max_posts, since_date, fields=DEFAULT_FIELDS):
+        try:
+            with open(self._resume_path(username), "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # State hanya valid untuk filter & profil kolom yang sama (post "fast" tidak punya lokasi/tag)
+        if (state.get("max_posts") != max_posts or state.get("since_date") != (str(since_date) if since_date else None)
+                or state.get("fields") != fields):
+            return None
+        # Cursor Instagram kedaluwarsa (best_before, sama seperti instaloader.resumable_iteration)
+        best_before = (state.get("iterator") or {}).get("best_before")
+        if not best_before or datetime.fromtimestamp(best_before) < datetime.now():
+            return None
+        return state
+
+    def _save_resume(self, username, max_posts, since_date, fields, post_iter, posts):
+        path = self._resume_path(username)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "max_posts": max_posts,
+                "since_date": str(since_date) if since_date else None,
+                "fields": fields,
+                "iterator": post_iter.freeze()._asdict(),
+                "posts": posts
+            }, f, default=str)
+
+    def _iter_timeline_edges(self, user_id, timeline, headers, errors=None):
+        """
+        Generator edge postingan: mulai dari edge yang tertanam di web_profile_info,
+        lalu mengikuti page_info.end_cursor via endpoint GraphQL ringan (lazy per halaman),
+        dibatasi timeline_limiter dan MAX_TIMELINE_PAGES.
+        Halaman yang gagal (status, halaman login, JSON rusak, timeout) menghentikan paging;
+        pesannya ditambahkan ke `errors` dan edge yang sudah dikirim tetap dipakai.
+        """
+        pages = 0
+        while True:
+            for edge in timeline.get('edges', []):
+                yield edge
+
+            page_info = timeline.get('page_info', {})
+            if not user_id or not page_info.get('has_next_page') or not page_info.get('end_cursor'):
+                return
+            if pages >= self.MAX_TIMELINE_PAGES:
+                return
+            pages += 1
+
+            self.timeline_limiter.wait()
+            variables = {"id": user_id, "first": self.TIMELINE_PAGE_SIZE, "after": page_info['end_cursor']}
+            try:
+                resp = self.client.get(
+                    "https://www.instagram.com/graphql/query/",
+                    params={"query_hash": self.TIMELINE_QUERY_HASH, "variables": json.dumps(variables)},
+                    headers=headers
+                )
+                if resp.status_code != 200:
+                    raise ValueError(f"Status {resp.status_code}")
+                timeline = (((resp.json().get('data') or {}).get('user') or {})
+                            .get('edge_owner_to_timeline_media') or {})
+            except Exception as e:
+                if errors is not None:
+                    errors.append(f"Paging stopped at page {pages}: {e}")
+                return
+
+    def get_data_hybrid(self, username, max_posts=10, since_date=None, on_post=None):
         """Metode Hybrid: Menggunakan logika yang terbukti berhasil di test.py"""
         clean_username = username.replace('@', '').strip()
         scraped_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -27,98 +260,29 @@ class InstagramScraper:
         url = f"https://www.instagram.com/api/v1/users/web_profile_info/?username={clean_username}"
         
         try:
-            with httpx.Client(headers=headers, follow_redirects=True, timeout=20.0) as client:
-                resp = client.get(url)
+            resp = self.client.get(url, headers=headers)
                 
-                if resp.status_code != 200:
-                    return {"error": f"IG Blocked (Status {resp.status_code})", "platform": "Instagram"}
-
-                data_json = resp.json().get('data', {}).get('user', {})
-                if not data_json:
-                    return {"error": "User data empty or Private Account", "platform": "Instagram"}
-
-                # 1. Profile Umum (Struktur Identik dengan get_detailed_data)
-                result = {
-                    "metadata": {
-                        "scraped_at": scraped_at,
-                        "total_posts_on_profile": data_json.get('edge_owner_to_timeline_media', {}).get('count', 0),
-                        "platform": "Instagram"
-                    },
-                    "profile_info": {
-                        "userid": data_json.get('id'),
-                        "username": data_json.get('username'),
-                        "full_name": data_json.get('full_name'),
-                        "bio": data_json.get('biography'),
-                        "profile_pic": data_json.get('profile_pic_url'),
-                        "is_business": data_json.get('is_business_account'),
-                        "business_category": data_json.get('business_category_name'),
-                        "external_url": data_json.get('external_url'),
-                        "followers": data_json.get('edge_followed_by', {}).get('count', 0),
-                        "following": data_json.get('edge_follow', {}).get('count', 0),
-                        "is_verified": data_json.get('is_verified'),
-                        "scraped_at": scraped_at
-                    },
-                    "posts": []
-                }
-
-                # 2. Postingan (Struktur Identik)
-                edges = data_json.get('edge_owner_to_timeline_media', {}).get('edges', [])
-                total_likes = 0
-                total_comments = 0
-
-                for edge in edges:
-                    if len(result["posts"]) >= max_posts:
-                        break
-                    
-                    node = edge.get('node', {})
-                    post_dt = datetime.fromtimestamp(node.get('taken_at_timestamp', 0))
-                    
-                    if since_date and post_dt.date() < since_date:
-                        break
+            if resp.status_code != 200:
+                return {"error": f"IG Blocked (Status {resp.status_code})", "platform": "Instagram"}
+
+            data_json = resp.json().get('data', {}).get('user', {})
+            if not data_json:
+                return {"error": "User data empty or Private Account", "platform": "Instagram"}
 
-                    lks = node.get('edge_media_preview_like', {}).get('count', 0)
-                    cmt = node.get('edge_media_to_comment', {}).get('count', 0)
-                    total_likes += lks
-                    total_comments += cmt
-
-                    # Caption Extraction
-                    cap = ""
-                    cap_edges = node.get('edge_media_to_caption', {}).get('edges', [])
-                    if cap_edges:
-                        cap = cap_edges[0].get('node', {}).get('text', '')
-
-                    result["posts"].append({
-                        "username": clean_username,
-                        "date": post_dt.strftime('%Y-%m-%d %H:%M:%S'),
-                        "caption": cap,
-                        "likes": lks,
-                        "comments_count": cmt,
-                        "url": f"https://www.instagram.com/p/{node.get('shortcode')}/",
-                        "hashtags": list(set(part[1:] for part in cap.split() if part.startswith('#'))),
-                        "mentions": list(set(part[1:] for part in cap.split() if part.startswith('@'))),
-                        "is_video": node.get('is_video', False),
-                        "typename": node.get('__typename'),
-                        "video_view_count": node.get('video_view_count', 0) if node.get('is_video') else 0,
-                        "location": node.get('location', {}).get('name') if node.get('location') else None,
-                        "tagged_users": [t.get('node', {}).get('user', {}).get('username') for t in node.get('edge_media_to_tagged_user', {}).get('edges', [])]
-                    })
-
-                # 3. Analytics
-                if result["posts"] and result["profile_info"]["followers"] > 0:
-                    avg_eng = (total_likes + total_comments) / len(result["posts"])
-                    er = (avg_eng / result["profile_info"]["followers"]) * 100
-                    result["profile_info"]["engagement_rate"] = round(er, 2)
-                    result["profile_info"]["avg_likes"] = round(total_likes / len(result["posts"]), 1)
-                else:
-                    result["profile_info"]["engagement_rate"] = 0
-                    result["profile_info"]["avg_likes"] = 0
-
-                return result
+            # Halaman berikutnya diambil bertahap sampai max_posts/since_date tercapai
+            page_errors = []
+            edges = self._iter_timeline_edges(
+                data_json.get('id'), data_json.get('edge_owner_to_timeline_media', {}), headers, page_errors
+            )
+            result = build_hybrid_result(data_json, clean_username, scraped_at, edges, max_posts, since_date, on_post)
+            if page_errors:
+                result["page_error"] = page_errors[0]
+            return result
 
         except Exception as e:
             return {"error": f"Hybrid Error: {str(e)}", "platform": "Instagram", "target": username}
         
-    def get_detailed_data(self, username, max_posts=10, since_date=None):
+    def get_detailed_data(self, username, max_posts=10, since_date=None, fields=DEFAULT_FIELDS):
         try:
             profile = instaloader.Profile.from_username(self.L.context, username)
             scraped_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -147,40 +311,71 @@ class InstagramScraper:
                 "posts": []
             }
 
-            total_likes = 0
-            total_comments = 0
-
             # 2. Data Postingan dengan Filter
-            for post in profile.get_posts():
-                # Filter 1: Batas Jumlah Postingan
-                if len(data["posts"]) >= max_posts:
-                    break
-                
-                # Filter 2: Batas Tanggal (Since Date)
-                if since_date and post.date_utc.date() < since_date:
-                    # Instaloader mengambil post dari yang terbaru, 
-                    # jadi jika sudah melewati since_date, kita bisa berhenti (break)
-                    break
-
-                total_likes += post.likes
-                total_comments += post.comments
-                
-                post_item = {
-                    "username": username,
-                    "date": post.date_utc.strftime('%Y-%m-%d %H:%M:%S'),
-                    "caption": post.caption,
-                    "likes": post.likes,
-                    "comments_count": post.comments,
-                    "url": f"https://www.instagram.com/p/{post.shortcode}/",
-                    "hashtags": post.caption_hashtags,
-                    "mentions": post.caption_mentions,
-                    "is_video": post.is_video,
-                    "typename": post.typename,
-                    "video_view_count": post.video_view_count if post.is_video else 0,
-                    "location": post.location.name if post.location else None,
-                    "tagged_users": post.tagged_users
-                }
-                data["posts"].append(post_item)
+            # Jika percobaan sebelumnya terputus (mis. rate limit), lanjutkan dari iterator yang dibekukan
+            post_iter = profile.get_posts()
+            resume = self._load_resume(username, max_posts, since_date, fields)
+            if resume:
+                try:
+                    post_iter.thaw(instaloader.FrozenNodeIterator(**resume["iterator"]))
+                    data["posts"] = resume["posts"]
+                except instaloader.exceptions.InvalidArgumentException:
+                    post_iter = profile.get_posts()
+
+            # freeze() memundurkan iterator satu item, sehingga post terakhir yang sudah
+            # tersimpan bisa dikembalikan lagi saat melanjutkan
+            saved_urls = {p["url"] for p in data["posts"]}
+            try:
+                for post in post_iter:
+                    # Filter 1: Batas Jumlah Postingan
+                    if len(data["posts"]) >= max_posts:
+                        break
+
+                    url = f"https://www.instagram.com/p/{post.shortcode}/"
+                    if url in saved_urls:
+                        continue
+                    
+                    # Filter 2: Batas Tanggal (Since Date)
+                    if since_date and post.date_utc.date() < since_date:
+                        # Instaloader mengambil post dari yang terbaru, 
+                        # jadi jika sudah melewati since_date, kita bisa berhenti (break)
+                        break
+                    
+                    # location & tagged_users memicu request metadata penuh per post
+                    enrich = fields == "full"
+                    post_item = {
+                        "username": username,
+                        "date": post.date_utc.strftime('%Y-%m-%d %H:%M:%S'),
+                        "caption": post.caption,
+                        "likes": post.likes,
+                        "comments_count": post.comments,
+                        "url": url,
+                        "hashtags": post.caption_hashtags,
+                        "mentions": post.caption_mentions,
+                        "is_video": post.is_video,
+                        "typename": post.typename,
+                        "video_view_count": post.video_view_count if post.is_video else 0,
+                        "location": (post.location.name if post.location else None) if enrich else None,
+                        "tagged_users": post.tagged_users if enrich else []
+                    }
+                    data["posts"].append(post_item)
+            except KeyboardInterrupt:
+                self._save_resume(username, max_posts, since_date, fields, post_iter, data["posts"])
+                raise
+            except Exception as e:
+                # Simpan progres agar percobaan berikutnya tidak mengulang dari awal
+                self._save_resume(username, max_posts, since_date, fields, post_iter, data["posts"])
+                raise instaloader.exceptions.InstaloaderException(
+                    f"{e} (progres {len(data['posts'])} post disimpan, jalankan ulang untuk melanjutkan)"
+                ) from e
+
+            if os.path.exists(self._resume_path(username)):
+                os.remove(self._resume_path(username))
+            if self.session_user and self.L.context.is_logged_in:
+                self.L.save_session_to_file()
+
+            total_likes = sum(p["likes"] for p in data["posts"])
+            total_comments = sum(p["comments_count"] for p in data["posts"])
 
             # 3. Analytics (Engagement Rate) berdasarkan data yang difilter
             post_count = len(data["posts"])
@@ -195,4 +390,14 @@ class InstagramScraper:
 
             return data
         except Exception as e:
-            return {"error": str(e), "metadata": {"status": "Error", "platform": "Instagram"}}
\ No newline at end of file
+            return {"error": str(e), "metadata": {"status": "Error", "platform": "Instagram"}}
+
+    def scrape(self, target, options):
+        o = scrape_options(options)
+        if o["method"] == "deep":
+            return self.get_detailed_data(target, max_posts=o["max_posts"], since_date=o["since_date"], fields=o["fields"])
+        return self.get_data_hybrid(target, max_posts=o["max_posts"], since_date=o["since_date"], on_post=o.get("on_post"))
+
+    def batch_workers(self, options):
+        # Instaloader (Deep) berbagi satu session login, jadi tetap serial
+        return 1 if scrape_options(options)["method"] == "deep" else None
@@ -1,53 +1,173 @@
-import httpx
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
 from datetime import datetime
-import time
+from concurrent.futures import ThreadPoolExecutor
+from utils.http import build_client
+from utils.ratelimit import RateLimiter
+from utils.html_parser import resolve_backend
+from scrapers.base import DEFAULT_FIELDS, BaseScraper, scrape_options
 
-class LinkedInScraper:
-    def __init__(self):
+
+# Halaman detail: hanya node ini yang dibangun menjadi tree (sisanya dilewati parser).
+# Halaman pencarian isinya hampir seluruhnya kartu <li>, jadi tidak disaring.
+DETAIL_CLASSES = {"description__text", "description__job-criteria-item", "num-applicants__caption", "topcard__org-name-link"}
+DETAIL_STRAINER = SoupStrainer(class_=lambda c: c is not None and not DETAIL_CLASSES.isdisjoint(c.split()))
+
+
+def _soup(html, backend, strainer=None):
+    return BeautifulSoup(html, 'lxml' if backend == 'lxml' else 'html.parser', parse_only=strainer)
+
+
+def _card_item(title, comp, loc, link, posted, keyword, scraped_at):
+    return {
+        "name": title,
+        "publisher": comp,
+        "location": loc,
+        "url": link,
+        "date": posted or scraped_at,
+        "caption": f"[{comp}] {title} in {loc}",
+        "scraped_at": scraped_at,
+        "platform": "LinkedIn",
+        "username": keyword, # Untuk filter dashboard
+    }
+
+
+def parse_card(card, keyword, scraped_at):
+    """Satu kartu lowongan (Tag BeautifulSoup) -> dict post (None jika kartu tidak lengkap)"""
+    try:
+        title = card.find('h3', class_='base-search-card__title').text.strip()
+        comp = card.find('h4', class_='base-search-card__subtitle').text.strip()
+        loc = card.find('span', class_='job-search-card__location').text.strip()
+        link = card.find('a', class_='base-card__full-link')['href'].split('?')[0]
+    except: return None
+
+    time_tag = card.find('time')
+    return _card_item(title, comp, loc, link, time_tag.get('datetime') if time_tag else None, keyword, scraped_at)
+
+
+def _parse_card_node(card, keyword, scraped_at):
+    """Versi selectolax dari parse_card"""
+    title = card.css_first('h3.base-search-card__title')
+    comp = card.css_first('h4.base-search-card__subtitle')
+    loc = card.css_first('span.job-search-card__location')
+    link = card.css_first('a.base-card__full-link')
+    href = link.attributes.get('href') if link else None
+    if not (title and comp and loc and href):
+        return None
+
+    time_tag = card.css_first('time')
+    return _card_item(
+        title.text().strip(), comp.text().strip(), loc.text().strip(), href.split('?')[0],
+        time_tag.attributes.get('datetime') if time_tag else None, keyword, scraped_at
+    )
+
+
+def parse_search_results(html, keyword, scraped_at, backend=None):
+    """HTML halaman pencarian guest -> dict post per kartu <li> (None untuk kartu tidak lengkap)"""
+    backend = resolve_backend(backend)
+    if backend == "selectolax":
+        return [_parse_card_node(card, keyword, scraped_at) for card in LexborHTMLParser(html).css('li')]
+    return [parse_card(card, keyword, scraped_at) for card in _soup(html, backend).find_all('li')]
+
+
+def _detail_dict(full_desc, criteria, applicants, company_link):
+    return {
+        "description": full_desc,
+        "seniority_level": criteria.get("Seniority level", "N/A"),
+        "employment_type": criteria.get("Employment type", "N/A"),
+        "job_function": criteria.get("Job function", "N/A"),
+        "industries": criteria.get("Industries", "N/A"),
+        "applicants_count": applicants,
+        "company_link": company_link
+    }
+
+
+def parse_job_detail(html, backend=None):
+    """HTML halaman detail lowongan -> dict detail (deskripsi, kriteria, pelamar)"""
+    backend = resolve_backend(backend)
+    if backend == "selectolax":
+        tree = LexborHTMLParser(html)
+        desc_div = tree.css_first('div.description__text')
+        criteria = {}
+        for it in tree.css('li.description__job-criteria-item'):
+            h, v = it.css_first('h3'), it.css_first('span')
+            criteria[h.text().strip() if h else "Other"] = v.text().strip() if v else "N/A"
+        app_tag = tree.css_first('span.num-applicants__caption')
+        comp_link_tag = tree.css_first('a.topcard__org-name-link')
+        comp_href = comp_link_tag.attributes.get('href') if comp_link_tag else None
+        return _detail_dict(
+            desc_div.text(separator="\n").strip() if desc_div else "N/A",
+            criteria,
+            app_tag.text().strip() if app_tag else "N/A",
+            comp_href.split('?')[0] if comp_href else "N/A"
+        )
+
+    s = _soup(html, backend, DETAIL_STRAINER)
+
+    # Full Description
+    desc_div = s.find('div', class_='description__text')
+    full_desc = desc_div.get_text(separator="\n").strip() if desc_div else "N/A"
+
+    # Criteria Map
+    criteria = {}
+    items = s.find_all('li', class_='description__job-criteria-item')
+    for it in items:
+        h = it.find('h3').text.strip() if it.find('h3') else "Other"
+        v = it.find('span').text.strip() if it.find('span') else "N/A"
+        criteria[h] = v
+
+    app_tag = s.find('span', class_='num-applicants__caption')
+    comp_link_tag = s.find('a', class_='topcard__org-name-link')
+
+    return _detail_dict(
+        full_desc,
+        criteria,
+        app_tag.text.strip() if app_tag else "N/A",
+        comp_link_tag['href'].split('?')[0] if comp_link_tag else "N/A"
+    )
+
+
+class LinkedInScraper(BaseScraper):
+    def __init__(self, http2=False, pool_limits=None, requests_per_second=2.0, detail_workers=4, html_parser=None):
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             "Accept-Language": "en-US,en;q=0.9",
         }
+        self.client = build_client(headers=self.headers, timeout=15.0, http2=http2, pool_limits=pool_limits, cache="LinkedIn")
+        # Budget request halaman detail (menggantikan sleep 1.8 detik per kartu)
+        self.limiter = RateLimiter(requests_per_second)
+        self.detail_workers = detail_workers
+        # selectolax/lxml jika terpasang (lihat utils.html_parser)
+        self.html_backend = resolve_backend(html_parser)
+        self.search_url = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
 
-    def _get_deep_detail(self, client, url):
+    def _get_deep_detail(self, url):
         """Mengambil data mendalam sesuai test.py"""
         try:
-            r = client.get(url, timeout=15.0)
+            self.limiter.wait()
+            r = self.client.get(url, timeout=15.0)
             if r.status_code == 200:
-                s = BeautifulSoup(r.text, 'html.parser')
-                
-                # Full Description
-                desc_div = s.find('div', class_='description__text')
-                full_desc = desc_div.get_text(separator="\n").strip() if desc_div else "N/A"
-                
-                # Criteria Map
-                criteria = {}
-                items = s.find_all('li', class_='description__job-criteria-item')
-                for it in items:
-                    h = it.find('h3').text.strip() if it.find('h3') else "Other"
-                    v = it.find('span').text.strip() if it.find('span') else "N/A"
-                    criteria[h] = v
-                
-                app_tag = s.find('span', class_='num-applicants__caption')
-                comp_link_tag = s.find('a', class_='topcard__org-name-link')
-                
-                return {
-                    "description": full_desc,
-                    "seniority_level": criteria.get("Seniority level", "N/A"),
-                    "employment_type": criteria.get("Employment type", "N/A"),
-                    "job_function": criteria.get("Job function", "N/A"),
-                    "industries": criteria.get("Industries", "N/A"),
-                    "applicants_count": app_tag.text.strip() if app_tag else "N/A",
-                    "company_link": comp_link_tag['href'].split('?')[0] if comp_link_tag else "N/A"
-                }
+                return parse_job_detail(r.text, self.html_backend)
         except: pass
         return {}
 
-    def get_data(self, keyword, max_posts=10, since_date=None):
+    def _fetch_search_page(self, keyword, start, scraped_at, since_date=None):
+        """Mengambil dan mem-parse satu halaman kartu lowongan dari offset `start`"""
+        params = {"keywords": keyword, "location": "Indonesia", "start": start}
+        if since_date:
+            # Urutkan terbaru dulu agar bisa berhenti saat melewati since_date
+            params["sortBy"] = "DD"
+        r = self.client.get(self.search_url, params=params)
+        if r.status_code != 200:
+            return []
+        return parse_search_results(r.text, keyword, scraped_at, self.html_backend)
+
+    def get_data(self, keyword, max_posts=10, since_date=None, fields=DEFAULT_FIELDS):
         clean_keyword = keyword.strip()
         scraped_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        base_url = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
         
         data = {
             "platform": "LinkedIn",
@@ -55,45 +175,72 @@ class LinkedInScraper:
             "posts": []
         }
 
-        with httpx.Client(headers=self.headers, follow_redirects=True) as client:
-            params = {"keywords": clean_keyword, "location": "Indonesia", "start": 0}
-            try:
-                r = client.get(base_url, params=params)
-                if r.status_code == 200:
-                    soup = BeautifulSoup(r.text, 'html.parser')
-                    cards = soup.find_all('li')
-                    
-                    for card in cards[:max_posts]:
-                        try:
-                            title = card.find('h3', class_='base-search-card__title').text.strip()
-                            comp = card.find('h4', class_='base-search-card__subtitle').text.strip()
-                            loc = card.find('span', class_='job-search-card__location').text.strip()
-                            link = card.find('a', class_='base-card__full-link')['href'].split('?')[0]
-                            
-                            # Deep Extractions
-                            details = self._get_deep_detail(client, link)
-                            time.sleep(1.8) 
-                            
-                            item = {
-                                "name": title,
-                                "publisher": comp,
-                                "location": loc,
-                                "url": link,
-                                "date": card.find('time')['datetime'] if card.find('time') else scraped_at,
-                                "caption": f"[{comp}] {title} in {loc}",
-                                "scraped_at": scraped_at,
-                                "platform": "LinkedIn",
-                                "username": clean_keyword, # Untuk filter dashboard
-                                "description": details.get("description", "N/A"),
-                                "seniority_level": details.get("seniority_level", "N/A"),
-                                "employment_type": details.get("employment_type", "N/A"),
-                                "job_function": details.get("job_function", "N/A"),
-                                "industries": details.get("industries", "N/A"),
-                                "applicants_count": details.get("applicants_count", "N/A"),
-                                "company_link": details.get("company_link", "N/A")
-                            }
-                            data["posts"].append(item)
-                        except: continue
-                return data
-            except Exception as e:
-                return {"error": str(e), "platform": "LinkedIn"}
\ No newline at end of file
+        try:
+            # Kartu di-parse berurutan, detail langsung diantrekan ke worker
+            # sehingga parsing kartu berikutnya overlap dengan fetch detail.
+            # Satu slot ekstra untuk prefetch halaman pencarian berikutnya.
+            pending = []
+            with ThreadPoolExecutor(max_workers=self.detail_workers + 1) as pool:
+                start = 0
+                page_future = pool.submit(self._fetch_search_page, clean_keyword, start, scraped_at, since_date)
+                while page_future:
+                    try:
+                        cards = page_future.result()
+                    except Exception as e:
+                        # Timeout/blokir di halaman berikutnya: berhenti paging dan pakai
+                        # kartu yang sudah terkumpul (error hanya jika halaman pertama gagal)
+                        if not pending:
+                            raise
+                        data["page_error"] = f"Paging stopped at offset {start}: {e}"
+                        break
+                    page_future = None
+                    if not cards:
+                        break
+
+                    # Prefetch halaman berikutnya selagi kartu halaman ini diperkaya
+                    start += len(cards)
+                    if len(pending) + len(cards) < max_posts:
+                        page_future = pool.submit(self._fetch_search_page, clean_keyword, start, scraped_at, since_date)
+
+                    for item in cards:
+                        if len(pending) >= max_posts:
+                            break
+                        if not item:
+                            continue
+                        if since_date and item["date"] != scraped_at:
+                            if datetime.strptime(item["date"][:10], '%Y-%m-%d').date() < since_date:
+                                # Sudah melewati since_date, halaman berikutnya tidak diperlukan
+                                if page_future:
+                                    page_future.cancel()
+                                page_future = None
+                                break
+                        # Deep Extractions (dilewati pada profil "fast")
+                        if fields == "fast":
+                            pending.append((item, None))
+                        else:
+                            pending.append((item, pool.submit(self._get_deep_detail, item["url"])))
+
+                    if len(pending) >= max_posts and page_future:
+                        page_future.cancel()
+                        page_future = None
+
+                # Kumpulkan sesuai urutan kartu
+                for item, future in pending:
+                    details = future.result() if future else {}
+                    item.update({
+                        "description": details.get("description", "N/A"),
+                        "seniority_level": details.get("seniority_level", "N/A"),
+                        "employment_type": details.get("employment_type", "N/A"),
+                        "job_function": details.get("job_function", "N/A"),
+                        "industries": details.get("industries", "N/A"),
+                        "applicants_count": details.get("applicants_count", "N/A"),
+                        "company_link": details.get("company_link", "N/A")
+                    })
+                    data["posts"].append(item)
+            return data
+        except Exception as e:
+            return {"error": str(e), "platform": "LinkedIn"}
+
+    def scrape(self, target, options):
+        o = scrape_options(options)
+        return self.get_data(target, max_posts=o["max_posts"], since_date=o["since_date"], fields=o["fields"])
@@ -1,9 +1,44 @@
 from google_play_scraper import app, reviews, Sort
 import pandas as pd
 import re
+import os
+import json
 from datetime import datetime
+from utils.disk_cache import CACHE_DIR
+from scrapers.base import BaseScraper, scrape_options
+
+
+def review_to_post(r, app_name, scraped_at):
+    """Satu dict ulasan google-play-scraper -> dict post"""
+    raw_content = str(r.get('content', ''))
+    clean_content = "".join(char for char in raw_content if char.isprintable())
+
+    return {
+        "review_id": r.get('reviewId'),
+        "user_name": r.get('userName'),
+        "user_image": r.get('userImage'),
+        "rating": r.get('score'),
+        "content": clean_content,
+        "app_version": r.get('reviewCreatedVersion'),
+        "date": r.get('at').strftime('%Y-%m-%d %H:%M:%S') if r.get('at') else None,
+        "reply_content": r.get('replyContent'),
+        "reply_date": r.get('repliedAt').strftime('%Y-%m-%d %H:%M:%S') if r.get('repliedAt') else None,
+        "thumbs_up": r.get('thumbsUpCount'),
+        "scraped_at": scraped_at,
+        # --- TAMBAHKAN INI AGAR DASHBOARD TIDAK ERROR ---
+        "app_name": app_name
+    }
+
+
+class PlayStoreScraper(BaseScraper):
+    # Jumlah ulasan per request continuation token
+    BATCH_SIZE = 200
+    # Batas ulasan yang disimpan per aplikasi untuk mode incremental
+    MAX_HISTORY = 20000
+
+    def __init__(self, history_dir=None):
+        self.history_dir = history_dir or os.path.join(CACHE_DIR, "playstore_reviews")
 
-class PlayStoreScraper:
     def extract_app_id(self, input_string: str):
         if "id=" in input_string:
             pattern = r'id=([a-zA-Z0-9._]+)'
@@ -11,22 +46,115 @@ class PlayStoreScraper:
             return match.group(1) if match else input_string
         return input_string.strip()
 
-    def get_detailed_data(self, target: str, lang='id', country='id', max_posts=1000):
+    def iter_reviews(self, app_id, lang='id', country='id', max_posts=1000, since_date=None, watermark=None):
+        """
+        Generator batch ulasan (urut terbaru) mengikuti continuation token.
+
+        Berhenti saat max_posts tercapai, ulasan habis, batch sudah melewati since_date,
+        atau bertemu watermark (review_id/date terbaru dari sync sebelumnya).
+        """
+        token = None
+        fetched = 0
+        while fetched < max_posts:
+            batch, token = reviews(
+                app_id,
+                lang=lang,
+                country=country,
+                sort=Sort.NEWEST,
+                count=min(self.BATCH_SIZE, max_posts - fetched),
+                continuation_token=token
+            )
+            if not batch:
+                return
+
+            crossed = False
+            if since_date:
+                kept = [r for r in batch if not r.get('at') or r['at'].date() >= since_date]
+                crossed = len(kept) < len(batch)
+                batch = kept
+
+            if watermark:
+                kept = []
+                for r in batch:
+                    if r.get('reviewId') == watermark.get('review_id') or self._format_date(r.get('at')) < watermark.get('date', ''):
+                        crossed = True
+                        break
+                    kept.append(r)
+                batch = kept
+
+            batch = batch[:max_posts - fetched]
+            fetched += len(batch)
+            if batch:
+                yield batch
+
+            # Sort.NEWEST: sekali melewati since_date/watermark, batch berikutnya pasti lebih lama
+            if crossed or token is None or getattr(token, 'token', None) is None:
+                return
+
+    @staticmethod
+    def _format_date(dt):
+        return dt.strftime('%Y-%m-%d %H:%M:%S') if dt else ''
+
+    def _history_path(self, app_id, lang, country):
+        return os.path.join(self.history_dir, f"{app_id}_{lang}_{country}.json")
+
+    def _load_history(self, app_id, lang, country):
+        try:
+            with open(self._history_path(app_id, lang, country), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"watermark": None, "posts": []}
+
+    def _save_history(self, app_id, lang, country, posts, watermark=None):
+        """Menyimpan riwayat; watermark default = ulasan terbaru di `posts`"""
+        if watermark is None:
+            newest = max((p for p in posts if p.get('date')), key=lambda p: p['date'], default=None)
+            watermark = {"review_id": newest['review_id'], "date": newest['date']} if newest else None
+        history = {
+            "watermark": watermark,
+            "posts": posts[:self.MAX_HISTORY]
+        }
+        path = self._history_path(app_id, lang, country)
+        os.makedirs(self.history_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(history, f)
+        os.replace(tmp_path, path)
+
+    def get_detailed_data(self, target: str, lang='id', country='id', max_posts=1000, since_date=None, incremental=False, on_post=None):
         try:
             app_id = self.extract_app_id(target)
             scraped_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             
             # 1. Metadata Aplikasi Lengkap
             info = app(app_id, lang=lang, country=country)
+
+            # Mode incremental: hanya ambil ulasan yang lebih baru dari watermark tersimpan
+            history = self._load_history(app_id, lang, country) if incremental else {"watermark": None, "posts": []}
             
-            # 2. Ambil Ulasan
-            rvs, _ = reviews(
-                app_id,
-                lang=lang,
-                country=country,
-                sort=Sort.NEWEST,
-                count=max_posts
-            )
+            # 2. Ambil Ulasan (bertahap per batch, berhenti di since_date/watermark)
+            limit, walk_since = max_posts, since_date
+            if history["watermark"]:
+                # Harus berjalan sampai watermark: berhenti di max_posts/since_date
+                # meninggalkan celah ulasan yang tidak akan pernah diambil lagi
+                limit, walk_since = self.MAX_HISTORY, None
+            since_str = since_date.strftime('%Y-%m-%d') if since_date else None
+
+            def in_range(post):
+                return not since_str or not post.get('date') or post['date'][:10] >= since_str
+
+            # Dengan on_post, ulasan dikirim per batch begitu diterima dan tidak ditahan di hasil
+            # (mode incremental tetap menyimpan ulasan baru untuk digabung ke riwayat)
+            new_posts = []
+            fetched = 0
+            for batch in self.iter_reviews(app_id, lang, country, limit, walk_since, history["watermark"]):
+                fetched += len(batch)
+                for r in batch:
+                    post = review_to_post(r, info.get('title'), scraped_at)
+                    if on_post and in_range(post):
+                        on_post(post)
+                    if incremental or not on_post:
+                        new_posts.append(post)
 
             data = {
                 "platform": "PlayStore",
@@ -46,26 +174,31 @@ class PlayStoreScraper:
                 "posts": []
             }
 
-            for r in rvs:
-                raw_content = str(r.get('content', ''))
-                clean_content = "".join(char for char in raw_content if char.isprintable())
-                
-                data["posts"].append({
-                    "review_id": r.get('reviewId'),
-                    "user_name": r.get('userName'),
-                    "user_image": r.get('userImage'),
-                    "rating": r.get('score'),
-                    "content": clean_content,
-                    "app_version": r.get('reviewCreatedVersion'),
-                    "date": r.get('at').strftime('%Y-%m-%d %H:%M:%S') if r.get('at') else None,
-                    "reply_content": r.get('replyContent'),
-                    "reply_date": r.get('repliedAt').strftime('%Y-%m-%d %H:%M:%S') if r.get('repliedAt') else None,
-                    "thumbs_up": r.get('thumbsUpCount'),
-                    "scraped_at": scraped_at,
-                    # --- TAMBAHKAN INI AGAR DASHBOARD TIDAK ERROR ---
-                    "app_name": info.get('title') 
-                })
+            data["posts"] = [] if on_post else new_posts
+
+            if incremental:
+                # Gabungkan ulasan baru dengan riwayat (yang baru menang jika review_id sama)
+                new_ids = {p['review_id'] for p in new_posts}
+                older = [p for p in history["posts"] if p.get('review_id') not in new_ids]
+                merged = new_posts + older
+                # Batas tercapai sebelum bertemu watermark: watermark lama dipertahankan
+                # agar sync berikutnya melanjutkan dari titik yang sama
+                kept_watermark = history["watermark"] if history["watermark"] and fetched >= limit else None
+                self._save_history(app_id, lang, country, merged, kept_watermark)
+                data["metadata"] = {"new_reviews": len(new_posts), "history_reviews": len(merged)}
+                if on_post:
+                    # Ulasan baru sudah dikirim saat walk, tinggal riwayat lama
+                    for post in older:
+                        if in_range(post):
+                            on_post(post)
+                else:
+                    data["posts"] = [p for p in merged if in_range(p)]
 
             return data
         except Exception as e:
-            return {"error": str(e), "platform": "PlayStore", "target": target}
\ No newline at end of file
+            return {"error": str(e), "platform": "PlayStore", "target": target}
+
+    def scrape(self, target, options):
+        o = scrape_options(options)
+        return self.get_detailed_data(target, max_posts=o["max_posts"], since_date=o["since_date"],
+                                      incremental=o["incremental"], on_post=o.get("on_post"))
@@ -0,0 +1,98 @@
+"""
+Registry platform -> scraper (dan dashboard-nya).
+
+Modul scraper hanya diimpor saat platform itu pertama kali dipakai, sehingga proses yang
+hanya melayani PlayStore tidak pernah mengimpor instaloader, yt-dlp, gnews, dst.
+"""
+import importlib
+import threading
+
+from scrapers.base import scrape_options
+from utils.batch import run_batch, MAX_WORKERS
+
+
+class PlatformSpec:
+    def __init__(self, name, scraper, dashboard=None):
+        self.name = name
+        self.scraper_path = scraper      # "modul:Kelas"
+        self.dashboard_path = dashboard  # "modul:fungsi_render"
+
+
+_REGISTRY = {}
+_lock = threading.Lock()
+_loaded = {}
+
+
+def register(name, scraper, dashboard=None):
+    _REGISTRY[name] = PlatformSpec(name, scraper, dashboard)
+
+
+# Urutan registrasi = urutan pilihan di sidebar
+register("Instagram", "scrapers.instagram:InstagramScraper", "ui.dashboards.instagram_dash:render_instagram_dashboard")
+register("Shopee", "scrapers.shopee:ShopeeScraper", "ui.dashboards.shopee_dash:render_shopee_dashboard")
+register("TikTok", "scrapers.tiktok:TikTokScraper", "ui.dashboards.tiktok_dash:render_tiktok_dashboard")
+register("PlayStore", "scrapers.playstore:PlayStoreScraper", "ui.dashboards.playstore_dash:render_playstore_dashboard")
+register("GoogleMaps", "scrapers.googlemaps:GoogleMapsScraper", "ui.dashboards.googlemaps_dash:render_googlemaps_dashboard")
+register("GoogleNews", "scrapers.googlenews:GoogleNewsScraper", "ui.dashboards.googlenews_dash:render_googlenews_dashboard")
+register("GoogleJobs", "scrapers.googlejobs:GoogleJobsScraper", "ui.dashboards.googlejobs_dash:render_googlejobs_dashboard")
+register("LinkedIn", "scrapers.linkedin:LinkedInScraper", "ui.dashboards.linkedin_dash:render_linkedin_dashboard")
+
+
+def platforms():
+    return list(_REGISTRY)
+
+
+def resolve_platform(name):
+    """Nama platform tanpa peduli huruf besar/kecil ("instagram" -> "Instagram"); None jika tidak dikenal"""
+    lowered = str(name or "").lower()
+    return next((p for p in _REGISTRY if p.lower() == lowered), None)
+
+
+def _load(path):
+    """Impor "modul:atribut" sekali per proses"""
+    with _lock:
+        if path not in _loaded:
+            module_name, attr = path.split(":")
+            _loaded[path] = getattr(importlib.import_module(module_name), attr)
+        return _loaded[path]
+
+
+def get_spec(platform):
+    spec = _REGISTRY.get(platform)
+    if spec is None:
+        raise KeyError(f"Unsupported platform: {platform}")
+    return spec
+
+
+def create_scraper(platform, **kwargs):
+    return _load(get_spec(platform).scraper_path)(**kwargs)
+
+
+def get_dashboard(platform):
+    spec = get_spec(platform)
+    return _load(spec.dashboard_path) if spec.dashboard_path else None
+
+
+def scrape(platform, target, options=None, scraper=None):
+    """Satu target lewat entry point seragam BaseScraper.scrape"""
+    scraper = scraper or create_scraper(platform)
+    return scraper.scrape(target, scrape_options(options))
+
+
+def scrape_many(platform, targets, options=None, scraper=None, max_workers=MAX_WORKERS, on_done=None, on_post=None):
+    """
+    Batch target paralel (urutan hasil = urutan input) dengan satu instance scraper.
+
+    on_post(idx, post) dipanggil dari thread worker begitu sebuah post diproduksi, untuk
+    scraper yang mendukung opsi "on_post" (lihat scrapers.base); posts-nya tidak ikut di hasil.
+    """
+    scraper = scraper or create_scraper(platform)
+    options = scrape_options(options)
+    workers = scraper.batch_workers(options) or max_workers
+
+    def task(idx, target):
+        if on_post is None:
+            return scraper.scrape(target, options)
+        return scraper.scrape(target, {**options, "on_post": lambda post: on_post(idx, post)})
+
+    return run_batch(targets, task, platform=platform, max_workers=workers, on_done=on_done, indexed=True)
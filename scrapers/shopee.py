@@ -1,42 +1,147 @@
-import httpx
 import re
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from utils.http import build_client
+from utils.disk_cache import JsonTTLCache
+from scrapers.base import BaseScraper, scrape_options
 
-class ShopeeScraper:
-    def __init__(self):
+
+def build_shop_result(s_data, shop_id, items, max_posts, scraped_at):
+    """Transform murni detail toko + daftar item API Shopee -> dict hasil"""
+    data = {
+        "platform": "Shopee",
+        "metadata": {"scraped_at": scraped_at, "status": "Success"},
+        "profile_info": {
+            "userid": s_data.get('shopid'),
+            "username": s_data.get('account', {}).get('username', shop_id),
+            "full_name": s_data.get('name', 'Shopee Seller'),
+            "bio": s_data.get('description', 'No Bio'),
+            "profile_pic": f"https://down-id.img.susercontent.com/file/{s_data.get('portrait')}" if s_data.get('portrait') else "",
+            "followers": s_data.get('follower_count', 0),
+            "following": 0,
+            "rating": round(s_data.get('rating_star', 0), 2),
+            "is_verified": s_data.get('is_shopee_verified', False),
+            "engagement_rate": 0, # Akan dihitung dari produk
+            "scraped_at": scraped_at
+        },
+        "posts": [] # Diisi dengan Produk (sebagai pengganti Posts)
+    }
+
+    seen_ids = set()
+    for item in items:
+        if len(data["posts"]) >= max_posts:
+            break
+        # Beberapa API Shopee membungkus data produk di dalam key 'item_basic'
+        basic_info = item.get('item_basic', item)
+
+        # Halaman yang bergeser (atau fallback) bisa mengulang produk yang sama
+        item_id = basic_info.get('itemid')
+        if item_id is not None:
+            if item_id in seen_ids:
+                continue
+            seen_ids.add(item_id)
+
+        data["posts"].append({
+            "username": data["profile_info"]["username"],
+            "date": scraped_at,
+            "caption": basic_info.get('name'),
+            "likes": basic_info.get('liked_count', 0),
+            "price": basic_info.get('price') / 100000 if basic_info.get('price') else 0,
+            "sold": basic_info.get('historical_sold', 0),
+            "stock": basic_info.get('stock', 0),
+            "url": f"https://shopee.co.id/product/{shop_id}/{item_id}",
+            "is_video": False
+        })
+
+    # Hitung ER Sederhana (Likes per Product / Followers)
+    if data["profile_info"]["followers"] > 0 and data["posts"]:
+        avg_likes = sum(p['likes'] for p in data['posts']) / len(data['posts'])
+        data["profile_info"]["engagement_rate"] = round((avg_likes / data["profile_info"]["followers"]) * 100, 2)
+
+    return data
+
+
+class ShopeeScraper(BaseScraper):
+    # Ukuran halaman get_search_items; limit besar sering dipotong/ditolak Shopee
+    PAGE_SIZE = 60
+
+    def __init__(self, http2=False, pool_limits=None, page_workers=4, shop_cache_ttl=7 * 24 * 3600, shop_cache_size=5000):
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             "Referer": "https://shopee.co.id/",
         }
+        # Satu pool koneksi ke shopee.co.id untuk resolusi username, profil toko, dan produk
+        self.client = build_client(headers=self.headers, timeout=20.0, http2=http2, pool_limits=pool_limits, cache="Shopee")
+        self.page_workers = page_workers
+        # Cache username -> shopid yang persisten di disk (dipakai ulang antar proses)
+        self.shop_cache = JsonTTLCache("shopee_shopids", ttl=shop_cache_ttl, max_entries=shop_cache_size)
 
     def extract_ids(self, input_string):
+        return self._resolve_shop(input_string)[0]
+
+    def _resolve_shop(self, input_string):
+        """Mengembalikan (shop_id, shop_detail); shop_detail terisi jika lookup username baru saja dilakukan"""
         # 1. Cek jika input adalah URL Produk (paling spesifik)
         product_match = re.search(r"product/(\d+)/(\d+)", input_string)
         if product_match:
-            return product_match.group(1) # Mengambil Shop ID
+            return product_match.group(1), None # Mengambil Shop ID
         
         # 2. Cek jika input adalah URL Toko dengan ID angka
         shop_id_match = re.search(r"shop/(\d+)", input_string)
         if shop_id_match:
-            return shop_id_match.group(1)
+            return shop_id_match.group(1), None
             
         # 3. Jika input adalah Username (basecomtech, cinta66898)
         # Ambil bagian terakhir dari URL jika itu bukan angka
         clean_url = input_string.split('?')[0].rstrip('/')
         username = clean_url.split('/')[-1]
+
+        cached_id = self.shop_cache.get(username.lower())
+        if cached_id:
+            return cached_id, None
         
         try:
             # Request ke Shopee untuk mendapatkan ID dari username
             search_api = f"https://shopee.co.id/api/v4/shop/get_shop_detail?username={username}"
-            with httpx.Client(headers=self.headers) as client:
-                res = client.get(search_api).json()
-                return str(res.get('data', {}).get('shopid'))
+            s_data = self.client.get(search_api).json().get('data') or {}
+            if not s_data.get('shopid'):
+                return None, None
+            shop_id = str(s_data['shopid'])
+            self.shop_cache.set(username.lower(), shop_id)
+            # Payload detail yang sama dipakai ulang untuk profile_info
+            return shop_id, s_data
         except:
-            return None
+            return None, None
+
+    def _get_items_page(self, shop_id, offset, limit):
+        item_api = f"https://shopee.co.id/api/v4/guide/get_search_items?limit={limit}&offset={offset}&order_by=sales&shopid={shop_id}"
+        item_res = self.client.get(item_api).json()
+        # Struktur response search_items sedikit berbeda
+        return (item_res.get('data') or {}).get('items') or []
+
+    def _get_items(self, pool, shop_id, max_posts, first_page):
+        """Mengumpulkan produk per halaman (offset) secara paralel sampai max_posts atau habis"""
+        page_size = min(self.PAGE_SIZE, max_posts)
+        items = list(first_page.result())
+        offset = page_size
+        exhausted = len(items) < page_size
+
+        while not exhausted and offset < max_posts:
+            # Satu gelombang halaman dikirim bersamaan, urutan offset tetap dijaga
+            offsets = list(range(offset, min(max_posts, offset + page_size * self.page_workers), page_size))
+            pages = [pool.submit(self._get_items_page, shop_id, o, min(page_size, max_posts - o)) for o in offsets]
+            for o, page in zip(offsets, pages):
+                page_items = page.result()
+                items.extend(page_items)
+                if len(page_items) < min(page_size, max_posts - o):
+                    exhausted = True
+                    break
+            offset = offsets[-1] + page_size
+        return items
 
     def get_data(self, input_target, max_posts=10, since_date=None):
         scraped_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        shop_id = self.extract_ids(input_target)
+        shop_id, shop_detail = self._resolve_shop(input_target)
         
         # Fallback data jika error agar app.py tidak crash
         empty_res = {
@@ -50,72 +155,32 @@ class ShopeeScraper:
             return empty_res
 
         try:
-            with httpx.Client(headers=self.headers, timeout=20.0) as client:
-                # 1. Ambil Profil Toko (Setara Profile Info di Sosmed)
-                shop_api = f"https://shopee.co.id/api/v4/shop/get_shop_detail?shopid={shop_id}"
-                shop_res = client.get(shop_api).json()
-                s_data = shop_res.get('data', {})
-
-                data = {
-                    "platform": "Shopee",
-                    "metadata": {"scraped_at": scraped_at, "status": "Success"},
-                    "profile_info": {
-                        "userid": s_data.get('shopid'),
-                        "username": s_data.get('account', {}).get('username', shop_id),
-                        "full_name": s_data.get('name', 'Shopee Seller'),
-                        "bio": s_data.get('description', 'No Bio'),
-                        "profile_pic": f"https://down-id.img.susercontent.com/file/{s_data.get('portrait')}" if s_data.get('portrait') else "",
-                        "followers": s_data.get('follower_count', 0),
-                        "following": 0,
-                        "rating": round(s_data.get('rating_star', 0), 2),
-                        "is_verified": s_data.get('is_shopee_verified', False),
-                        "engagement_rate": 0, # Akan dihitung dari produk
-                        "scraped_at": scraped_at
-                    },
-                    "posts": [] # Diisi dengan Produk (sebagai pengganti Posts)
-                }
-
-                # 2. Ambil Daftar Produk menggunakan Search API (Lebih Stabil)
+            with ThreadPoolExecutor(max_workers=self.page_workers + 1) as pool:
+                # 1. Profil toko dan halaman produk pertama diambil bersamaan
+                # (profil dilewati jika sudah didapat dari lookup username)
+                first_page = pool.submit(self._get_items_page, shop_id, 0, min(self.PAGE_SIZE, max_posts))
+                if shop_detail:
+                    s_data = shop_detail
+                else:
+                    shop_api = f"https://shopee.co.id/api/v4/shop/get_shop_detail?shopid={shop_id}"
+                    s_data = pool.submit(lambda: self.client.get(shop_api).json()).result().get('data', {})
+
+                # 2. Ambil Daftar Produk menggunakan Search API (Lebih Stabil), dipaginasi per offset
                 # Kita menggunakan endpoint 'search_items' dengan parameter 'order_by=sales' untuk produk terlaris
-                item_api = f"https://shopee.co.id/api/v4/guide/get_search_items?limit={max_posts}&offset=0&order_by=sales&shopid={shop_id}"
-                item_res = client.get(item_api).json()
-
-                # Struktur response search_items sedikit berbeda
-                items = item_res.get('data', {}).get('items', [])
-
-                # Jika search_items kosong, kita coba fallback ke API rekomendasi yang lama
-                if not items:
-                    rec_api = f"https://shopee.co.id/api/v4/recommend/recommend?bundle=shop_page_product_tab_main&limit={max_posts}&shopid={shop_id}"
-                    rec_res = client.get(rec_api).json()
-                    items = rec_res.get('data', {}).get('sections', [{}])[0].get('data', {}).get('item', [])
-
-                total_sold = 0
-                for item in items:
-                    # Beberapa API Shopee membungkus data produk di dalam key 'item_basic'
-                    basic_info = item.get('item_basic', item) 
-                    
-                    sold = basic_info.get('historical_sold', 0)
-                    total_sold += sold
-                    
-                    data["posts"].append({
-                        "username": data["profile_info"]["username"],
-                        "date": scraped_at,
-                        "caption": basic_info.get('name'),
-                        "likes": basic_info.get('liked_count', 0),
-                        "price": basic_info.get('price') / 100000 if basic_info.get('price') else 0,
-                        "sold": sold,
-                        "stock": basic_info.get('stock', 0),
-                        "url": f"https://shopee.co.id/product/{shop_id}/{basic_info.get('itemid')}",
-                        "is_video": False
-                    })
-
-                # Hitung ER Sederhana (Likes per Product / Followers)
-                if data["profile_info"]["followers"] > 0 and data["posts"]:
-                    avg_likes = sum(p['likes'] for p in data['posts']) / len(data['posts'])
-                    data["profile_info"]["engagement_rate"] = round((avg_likes / data["profile_info"]["followers"]) * 100, 2)
-
-                return data
+                items = self._get_items(pool, shop_id, max_posts, first_page)
+
+            # Jika search_items kosong, kita coba fallback ke API rekomendasi yang lama
+            if not items:
+                rec_api = f"https://shopee.co.id/api/v4/recommend/recommend?bundle=shop_page_product_tab_main&limit={min(max_posts, self.PAGE_SIZE)}&shopid={shop_id}"
+                rec_res = self.client.get(rec_api).json()
+                items = rec_res.get('data', {}).get('sections', [{}])[0].get('data', {}).get('item', [])
+
+            return build_shop_result(s_data, shop_id, items, max_posts, scraped_at)
 
         except Exception as e:
             empty_res["error"] = str(e)
-            return empty_res
\ No newline at end of file
+            return empty_res
+
+    def scrape(self, target, options):
+        o = scrape_options(options)
+        return self.get_data(target, max_posts=o["max_posts"], since_date=o["since_date"])
@@ -1,11 +1,71 @@
 import yt_dlp
-import httpx
 from bs4 import BeautifulSoup
 import json
+import re
+import threading
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from utils.http import build_client
+from scrapers.base import BaseScraper, scrape_options
 
-class TikTokScraper:
-    def __init__(self):
+
+# Tag script berisi JSON state halaman; dicari langsung di bytes respons
+REHYDRATION_SCRIPT_RE = re.compile(rb'<script[^>]*\bid=["\']?__UNIVERSAL_DATA_FOR_REHYDRATION__\b[^>]*>')
+
+
+def find_rehydration_json(content):
+    """Slice JSON __UNIVERSAL_DATA_FOR_REHYDRATION__ langsung dari bytes (tanpa membangun DOM); None jika tidak ada"""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    match = REHYDRATION_SCRIPT_RE.search(content)
+    if not match:
+        return None
+    end = content.find(b'</script>', match.end())
+    if end < 0:
+        return None
+    try:
+        return json.loads(content[match.end():end])
+    except ValueError:
+        return None
+
+
+def soup_rehydration_json(content):
+    """Jalur lama via BeautifulSoup, dipakai jika fast path gagal"""
+    soup = BeautifulSoup(content, 'html.parser')
+    script = soup.find('script', id='__UNIVERSAL_DATA_FOR_REHYDRATION__')
+    if not script:
+        return None
+    return json.loads(script.string)
+
+
+def parse_rehydration_profile(content):
+    """HTML profil TikTok (bytes/str) -> dict profil dari __UNIVERSAL_DATA_FOR_REHYDRATION__ ({} jika tidak ada)"""
+    raw_json = find_rehydration_json(content)
+    if raw_json is None:
+        raw_json = soup_rehydration_json(content)
+    if raw_json is None:
+        return {}
+    user_info = raw_json['__DEFAULT_SCOPE__']['webapp.user-detail']['userInfo']
+    u = user_info['user']
+    s = user_info['stats']
+    return {
+        "userid": u.get('id'),
+        "username": u.get('uniqueId'),
+        "full_name": u.get('nickname'),
+        "bio": u.get('signature'),
+        "followers": s.get('followerCount', 0),
+        "following": s.get('followingCount', 0),
+        "total_likes": s.get('heartCount', 0),
+        "is_verified": u.get('verified', False),
+    }
+
+
+class TikTokScraper(BaseScraper):
+    # Video yang di-pin bisa lebih lama dari since_date walau tampil paling atas,
+    # jadi berhenti hanya setelah beberapa video lama berturut-turut
+    MAX_OLD_STREAK = 3
+
+    def __init__(self, http2=False, pool_limits=None):
         self.ydl_opts = {
             'quiet': True,
             'no_warnings': True,
@@ -15,101 +75,113 @@ class TikTokScraper:
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
         }
+        self.client = build_client(headers=self.headers, timeout=10.0, http2=http2, pool_limits=pool_limits, cache="TikTok")
+        # Fetch profil httpx berjalan di background selagi yt-dlp mengekstrak playlist
+        self._profile_pool = ThreadPoolExecutor(max_workers=4)
+        self._local = threading.local()
 
-    def get_data(self, username, max_posts=10, since_date=None):
+    def _get_ydl(self):
+        """YoutubeDL (beserta extractor yang sudah diinisialisasi) dipakai ulang per worker thread"""
+        ydl = getattr(self._local, 'ydl', None)
+        if ydl is None:
+            ydl = yt_dlp.YoutubeDL(self.ydl_opts)
+            self._local.ydl = ydl
+        return ydl
+
+    def _fetch_profile(self, url):
+        """Ambil profil dari __UNIVERSAL_DATA_FOR_REHYDRATION__ (metode httpx)"""
+        try:
+            resp = self.client.get(url)
+            if resp.status_code == 200:
+                return parse_rehydration_profile(resp.content)
+        except Exception: pass # Fallback ke yt-dlp jika httpx gagal
+        return {}
+
+    def get_data(self, username, max_posts=10, since_date=None, on_post=None):
         clean_username = username.replace('@', '').strip()
         url = f"https://www.tiktok.com/@{clean_username}"
         scraped_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
-        # --- BAGIAN 1: AMBIL PROFIL (METODE HTTPX) ---
-        profile_data = {}
-        try:
-            with httpx.Client(headers=self.headers, follow_redirects=True, timeout=10.0) as client:
-                resp = client.get(url)
-                if resp.status_code == 200:
-                    soup = BeautifulSoup(resp.text, 'html.parser')
-                    script = soup.find('script', id='__UNIVERSAL_DATA_FOR_REHYDRATION__')
-                    if script:
-                        raw_json = json.loads(script.string)
-                        user_info = raw_json['__DEFAULT_SCOPE__']['webapp.user-detail']['userInfo']
-                        u = user_info['user']
-                        s = user_info['stats']
-                        profile_data = {
-                            "userid": u.get('id'),
-                            "username": u.get('uniqueId'),
-                            "full_name": u.get('nickname'),
-                            "bio": u.get('signature'),
-                            "followers": s.get('followerCount', 0),
-                            "following": s.get('followingCount', 0),
-                            "total_likes": s.get('heartCount', 0),
-                            "is_verified": u.get('verified', False),
-                        }
-        except Exception: pass # Fallback ke yt-dlp jika httpx gagal
+        # --- BAGIAN 1: AMBIL PROFIL (METODE HTTPX), berjalan paralel dengan yt-dlp ---
+        profile_future = self._profile_pool.submit(self._fetch_profile, url)
 
         # --- BAGIAN 2: AMBIL POSTINGAN (METODE YT-DLP) ---
         try:
-            with yt_dlp.YoutubeDL(self.ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-                
-                # Gunakan data httpx, jika kosong gunakan data yt-dlp
-                data = {
-                    "platform": "TikTok",
-                    "profile_info": {
-                        "userid": profile_data.get('userid', info.get('id')),
+            # process=False: entries tetap berupa generator dari extractor (lazy),
+            # halaman playlist berikutnya hanya diminta saat kita lanjut iterasi
+            info = self._get_ydl().extract_info(url, download=False, process=False)
+
+            entries = info.get('entries') or []
+            valid_posts = []
+            post_count = 0
+            total_likes_for_er = 0
+            old_streak = 0
+            
+            for entry in entries:
+                if post_count >= max_posts: break
+                post_ts = entry.get('timestamp')
+                if post_ts:
+                    post_dt = datetime.fromtimestamp(post_ts)
+                    if since_date and post_dt.date() < since_date:
+                        old_streak += 1
+                        # Profil urut terbaru, jadi sisa playlist tidak perlu diekstrak
+                        if old_streak >= self.MAX_OLD_STREAK: break
+                        continue
+                    old_streak = 0
+                        
+                    likes = entry.get('like_count', 0) or 0
+                    total_likes_for_er += likes
+                    post_count += 1
+                    post = {
                         "username": clean_username,
-                        "full_name": profile_data.get('full_name', info.get('uploader', clean_username)),
-                        "bio": profile_data.get('bio', "No Bio"),
-                        "profile_pic": info.get('thumbnails', [{}])[0].get('url', '') if info.get('thumbnails') else '',
-                        "followers": profile_data.get('followers', info.get('follower_count', 0)),
-                        "following": profile_data.get('following', 0),
-                        "total_likes": profile_data.get('total_likes', info.get('like_count', 0)),
-                        "is_verified": profile_data.get('is_verified', False),
-                        "engagement_rate": 0,
-                        "scraped_at": scraped_at
-                    },
-                    "posts": []
-                }
-
-                entries = info.get('entries', [])
-                valid_posts = []
-                total_likes_for_er = 0
-                
-                for entry in entries:
-                    if len(valid_posts) >= max_posts: break
-                    post_ts = entry.get('timestamp')
-                    if post_ts:
-                        post_dt = datetime.fromtimestamp(post_ts)
-                        if since_date and post_dt.date() < since_date: continue
-                            
-                        likes = entry.get('like_count', 0) or 0
-                        total_likes_for_er += likes
-                        valid_posts.append({
-                            "username": clean_username,
-                            "date": post_dt.strftime('%Y-%m-%d %H:%M:%S'),
-                            "caption": entry.get('title', 'No Caption'),
-                            "likes": likes,
-                            "comments_count": entry.get('comment_count', 0),
-                            "views": entry.get('view_count', 0),
-                            "shares": entry.get('repost_count', 0),
-                            "url": entry.get('webpage_url', ''),
-                        })
-
-                # data["posts"] = valid_posts
-                # if data['profile_info']['followers'] > 0 and valid_posts:
-                #     avg_likes = total_likes_for_er / len(valid_posts)
-                #     er = (avg_likes / data['profile_info']['followers']) * 100
-                #     data['profile_info']['engagement_rate'] = round(er, 2)
-                # return data
-
-                data["posts"] = valid_posts
-                
-                # Hitung ER berdasarkan data followers dari httpx dan likes dari yt-dlp
-                if data['profile_info']['followers'] > 0 and valid_posts:
-                    avg_likes = total_likes_for_er / len(valid_posts)
-                    er = (avg_likes / data['profile_info']['followers']) * 100
-                    data['profile_info']['engagement_rate'] = round(er, 2)
-                
-                return data
+                        "date": post_dt.strftime('%Y-%m-%d %H:%M:%S'),
+                        "caption": entry.get('title', 'No Caption'),
+                        "likes": likes,
+                        "comments_count": entry.get('comment_count', 0),
+                        "views": entry.get('view_count', 0),
+                        "shares": entry.get('repost_count', 0),
+                        "url": entry.get('webpage_url') or f"https://www.tiktok.com/@{clean_username}/video/{entry.get('id')}",
+                    }
+                    # Dengan on_post, video dikirim selagi playlist masih diekstrak
+                    if on_post:
+                        on_post(post)
+                    else:
+                        valid_posts.append(post)
+                    # Berhenti sebelum generator meminta entry berikutnya (bisa memicu halaman item_list baru)
+                    if post_count >= max_posts: break
+
+            profile_data = profile_future.result()
+            
+            # Gunakan data httpx, jika kosong gunakan data yt-dlp
+            data = {
+                "platform": "TikTok",
+                "profile_info": {
+                    "userid": profile_data.get('userid', info.get('id')),
+                    "username": clean_username,
+                    "full_name": profile_data.get('full_name', info.get('uploader', clean_username)),
+                    "bio": profile_data.get('bio', "No Bio"),
+                    "profile_pic": info.get('thumbnails', [{}])[0].get('url', '') if info.get('thumbnails') else '',
+                    "followers": profile_data.get('followers', info.get('follower_count', 0)),
+                    "following": profile_data.get('following', 0),
+                    "total_likes": profile_data.get('total_likes', info.get('like_count', 0)),
+                    "is_verified": profile_data.get('is_verified', False),
+                    "engagement_rate": 0,
+                    "scraped_at": scraped_at
+                },
+                "posts": valid_posts
+            }
+            
+            # Hitung ER berdasarkan data followers dari httpx dan likes dari yt-dlp
+            if data['profile_info']['followers'] > 0 and post_count:
+                avg_likes = total_likes_for_er / post_count
+                er = (avg_likes / data['profile_info']['followers']) * 100
+                data['profile_info']['engagement_rate'] = round(er, 2)
+            
+            return data
 
         except Exception as e:
-            return {"error": str(e), "platform": "TikTok"}
\ No newline at end of file
+            return {"error": str(e), "platform": "TikTok"}
+
+    def scrape(self, target, options):
+        o = scrape_options(options)
+        return self.get_data(target, max_posts=o["max_posts"], since_date=o["since_date"], on_post=o.get("on_post"))
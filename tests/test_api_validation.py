@@ -0,0 +1,52 @@
+import pytest
+
+pytest.importorskip("flask")
+
+from api import main
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(main.jobs, "submit", lambda *a, **kw: pytest.fail("job tidak boleh dibuat"))
+    monkeypatch.setattr(main.registry, "scrape", lambda *a, **kw: pytest.fail("scraper tidak boleh dipanggil"))
+    return main.app.test_client()
+
+
+@pytest.mark.parametrize("options", [
+    {"since_date": 20240101},
+    {"since_date": "01-01-2024"},
+    {"max_posts": "abc"},
+    {"max_posts": [10]},
+    {"max_posts": 0},
+    {"slice_days": {"days": 7}},
+    {"slice_days": 0},
+    {"incremental": "yes"},
+    {"fields": ["fast"]},
+])
+def test_invalid_job_options_return_400(client, options):
+    r = client.post("/api/jobs", json={"platform": "playstore", "targets": ["com.example"], "options": options})
+    assert r.status_code == 400
+    assert "error" in r.get_json()
+
+
+@pytest.mark.parametrize("query", [
+    {"max_posts": "abc"},
+    {"max_posts": "-1"},
+    {"since_date": "2024"},
+    {"fields": "full-ish"},
+    {"target": ""},
+])
+def test_invalid_scrape_query_returns_400(client, query):
+    r = client.get("/api/scrape", query_string={"platform": "playstore", "target": "com.example", **query})
+    assert r.status_code == 400
+    assert "error" in r.get_json()
+
+
+def test_valid_scrape_query_is_parsed(client, monkeypatch):
+    calls = []
+    monkeypatch.setattr(main.registry, "scrape", lambda platform, target, options: calls.append(options) or {"posts": []})
+    r = client.get("/api/scrape", query_string={"platform": "playstore", "target": "com.example",
+                                                "max_posts": "5", "since_date": "2024-01-01", "incremental": "true"})
+    assert r.status_code == 200
+    assert calls[0]["max_posts"] == 5 and calls[0]["incremental"] is True
+    assert calls[0]["since_date"].isoformat() == "2024-01-01"
@@ -0,0 +1,33 @@
+import os
+
+from scrapers.googlemaps import listing_to_post, parse_local_results
+
+FIXTURES = os.path.join(os.path.dirname(__file__), os.pardir, "benchmarks", "fixtures")
+
+
+def _read(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_basic_layout_is_parsed_per_block():
+    posts = [listing_to_post(l, "now") for l in parse_local_results(_read("googlemaps_lcl_basic.html"))]
+    assert [(p["name"], p["rating"], p["reviews_count"]) for p in posts] == [
+        ("KFC Sarinah", 4.5, "2,1rb"), ("KFC Cikini", 4.3, "512"), ("KFC Menteng", 4.2, "845"), ("KFC Senen", 4.0, "1.204"),
+    ]
+    assert posts[2]["category"] == "Restoran ayam"
+    assert posts[2]["address"] == "Jl. H.O.S. Cokroaminoto No.78"
+    assert posts[0]["url"].startswith("https://www.google.com/url?q=https://maps.google.com/")
+
+
+def test_missing_rating_does_not_shift_later_listings():
+    page = _read("googlemaps_lcl_basic.html").replace("<span>4,3</span> ", "", 1)
+    ratings = [(l["name"], l["rating"]) for l in parse_local_results(page)]
+    assert ratings == [("KFC Sarinah", 4.5), ("KFC Cikini", None), ("KFC Menteng", 4.2), ("KFC Senen", 4.0)]
+
+
+def test_unmarked_page_falls_back_to_legacy_regex():
+    page = _read("googlemaps_lcl_basic.html").replace("X7NTVe", "zz9Qx").replace("q5WnMd", "aa1Bc")
+    page = page.replace("<span>4,3</span> ", "", 1)
+    ratings = [(l["name"], l["rating"]) for l in parse_local_results(page)]
+    assert ratings == [("KFC Sarinah", 4.5), ("KFC Cikini", None), ("KFC Menteng", 4.2), ("KFC Senen", 4.0)]
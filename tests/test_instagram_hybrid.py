@@ -0,0 +1,60 @@
+import pytest
+
+import scrapers.instagram as ig
+
+
+def _edges(start, count):
+    return [{"node": {"shortcode": f"p{i}", "taken_at_timestamp": 1717000000 - i}} for i in range(start, start + count)]
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None, text=""):
+        self.status_code = status_code
+        self._payload = payload
+        self.text = text
+
+    def json(self):
+        if self._payload is None:
+            raise ValueError("Expecting value: line 1 column 1 (char 0)")
+        return self._payload
+
+
+class FakeClient:
+    """web_profile_info dengan 3 edge tertanam; endpoint GraphQL mengembalikan halaman login HTML"""
+
+    def __init__(self):
+        self.graphql_calls = 0
+
+    def get(self, url, params=None, headers=None):
+        if "web_profile_info" in url:
+            return FakeResponse(200, {"data": {"user": {
+                "id": "1", "username": "demo", "edge_followed_by": {"count": 100},
+                "edge_owner_to_timeline_media": {"count": 30, "edges": _edges(0, 3),
+                                                 "page_info": {"has_next_page": True, "end_cursor": "c1"}},
+            }}})
+        self.graphql_calls += 1
+        return FakeResponse(200, text="<html>login</html>")
+
+
+@pytest.fixture
+def scraper(monkeypatch, tmp_path):
+    monkeypatch.setattr(ig, "INSTALOADER_STATE_DIR", str(tmp_path))
+    monkeypatch.delenv("IG_SESSION_USER", raising=False)
+    s = ig.InstagramScraper(timeline_requests_per_second=1000)
+    s.client = FakeClient()
+    return s
+
+
+def test_max_posts_within_embedded_edges_skips_graphql(scraper):
+    result = scraper.get_data_hybrid("demo", max_posts=3)
+    assert len(result["posts"]) == 3
+    assert scraper.client.graphql_calls == 0
+    assert "page_error" not in result
+
+
+def test_failed_graphql_page_keeps_embedded_posts(scraper):
+    result = scraper.get_data_hybrid("demo", max_posts=9999)
+    assert "error" not in result
+    assert [p["url"] for p in result["posts"]] == [f"https://www.instagram.com/p/p{i}/" for i in range(3)]
+    assert scraper.client.graphql_calls == 1
+    assert result["page_error"].startswith("Paging stopped")
@@ -0,0 +1,115 @@
+import json
+import pickle
+from datetime import datetime, timedelta
+
+import instaloader
+import pytest
+
+import scrapers.instagram as ig
+
+
+def _page(codes, has_next):
+    return {
+        "edges": [{"node": {"shortcode": c}} for c in codes],
+        "page_info": {"has_next_page": has_next, "end_cursor": "cursor-2" if has_next else None},
+    }
+
+
+class FakePost:
+    def __init__(self, node):
+        self.shortcode = node["shortcode"]
+        self.date_utc = datetime(2024, 6, 1)
+        self.caption = self.shortcode
+        self.likes = 1
+        self.comments = 0
+        self.caption_hashtags = []
+        self.caption_mentions = []
+        self.is_video = False
+        self.typename = "GraphImage"
+        self.video_view_count = None
+
+
+class FakeContext:
+    """Halaman kedua gagal (mis. 429) selama `fail` bernilai True"""
+    username = None
+
+    def __init__(self):
+        self.fail = True
+
+    def graphql_query(self, query_hash, variables, referer=None):
+        if self.fail:
+            raise instaloader.exceptions.ConnectionException("429 Too Many Requests")
+        return _page(["p4", "p5"], has_next=False)
+
+
+class FakeProfile:
+    mediacount = 5
+    userid = 1
+    username = "contoh.brand"
+    full_name = biography = profile_pic_url = ""
+    is_business_account = is_verified = False
+    business_category_name = external_url = None
+    followers = 100
+    followees = 1
+
+    def __init__(self, context):
+        self.context = context
+
+    def get_posts(self):
+        return instaloader.NodeIterator(self.context, "hash", lambda d: d, FakePost, first_data=_page(["p1", "p2", "p3"], has_next=True))
+
+
+@pytest.fixture
+def scraper(monkeypatch, tmp_path):
+    monkeypatch.setattr(ig, "INSTALOADER_STATE_DIR", str(tmp_path))
+    monkeypatch.delenv("IG_SESSION_USER", raising=False)
+    context = FakeContext()
+    monkeypatch.setattr(instaloader.Profile, "from_username", staticmethod(lambda ctx, name: FakeProfile(context)))
+    s = ig.InstagramScraper()
+    s.fake_context = context
+    return s
+
+
+def test_resume_after_failed_page_query_does_not_duplicate(scraper):
+    first = scraper.get_detailed_data("contoh.brand", max_posts=10, fields="fast")
+    assert "error" in first
+    with open(scraper._resume_path("contoh.brand"), encoding="utf-8") as f:
+        assert [p["caption"] for p in json.load(f)["posts"]] == ["p1", "p2", "p3"]
+
+    scraper.fake_context.fail = False
+    second = scraper.get_detailed_data("contoh.brand", max_posts=10, fields="fast")
+    assert [p["caption"] for p in second["posts"]] == ["p1", "p2", "p3", "p4", "p5"]
+
+
+def test_expired_resume_state_is_ignored(scraper):
+    scraper.get_detailed_data("contoh.brand", max_posts=10, fields="fast")
+    path = scraper._resume_path("contoh.brand")
+    with open(path, encoding="utf-8") as f:
+        state = json.load(f)
+    state["iterator"]["best_before"] = (datetime.now() - timedelta(hours=1)).timestamp()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+
+    assert scraper._load_resume("contoh.brand", 10, None, "fast") is None
+
+
+def test_fast_resume_state_is_not_used_by_full_run(scraper):
+    scraper.get_detailed_data("contoh.brand", max_posts=10, fields="fast")
+    assert scraper._load_resume("contoh.brand", 10, None, "fast") is not None
+    assert scraper._load_resume("contoh.brand", 10, None, "full") is None
+
+
+def test_session_from_instaloader_login_is_reused(monkeypatch, tmp_path):
+    # `instaloader --login demo` menyimpan session di lokasi default instaloader
+    monkeypatch.setattr(ig, "INSTALOADER_STATE_DIR", str(tmp_path))
+    session_file = tmp_path / "session-demo"
+    monkeypatch.setattr(instaloader.instaloader, "get_default_session_filename", lambda user: str(tmp_path / f"session-{user}"))
+    with open(session_file, "wb") as f:
+        pickle.dump({"sessionid": "abc", "csrftoken": "def"}, f)
+
+    s = ig.InstagramScraper(session_user="demo")
+    assert s.L.context.is_logged_in and s.L.context.username == "demo"
+
+    session_file.unlink()
+    s.L.save_session_to_file()
+    assert session_file.exists()
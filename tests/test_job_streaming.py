@@ -0,0 +1,103 @@
+import functools
+import json
+import threading
+from datetime import datetime
+
+import pytest
+
+import api.jobs as jobs_module
+from api.jobs import JobManager
+from api.streaming import stream_job
+from scrapers import registry
+
+
+class SinkScraper:
+    """Post kedua baru diproduksi setelah konsumen menerima post pertama"""
+
+    def __init__(self):
+        self.first_sent = threading.Event()
+
+    def batch_workers(self, options):
+        return 1
+
+    def scrape(self, target, options):
+        on_post = options.get("on_post")
+        on_post({"url": f"{target}/1"})
+        assert self.first_sent.wait(5), "post pertama tidak di-stream sebelum target selesai"
+        on_post({"url": f"{target}/2"})
+        return {"profile_info": {"username": target}, "posts": []}
+
+
+class PlainScraper:
+    def batch_workers(self, options):
+        return 1
+
+    def scrape(self, target, options):
+        return {"profile_info": {"username": target}, "posts": [{"url": f"{target}/1"}, {"url": f"{target}/2"}]}
+
+
+def _run_stream(monkeypatch, scraper, on_line=None):
+    monkeypatch.setattr(jobs_module, "scrape_many", functools.partial(registry.scrape_many, scraper=scraper))
+    job = JobManager(workers=1).submit("PlayStore", ["app.a"], {}, stream=True)
+    assert job.claim_stream() and not job.claim_stream()
+    records = []
+    for chunk in stream_job(job):
+        for line in chunk.decode().splitlines():
+            records.append(json.loads(line))
+            if on_line:
+                on_line(records[-1])
+    return job, records
+
+
+def test_posts_are_streamed_before_target_finishes(monkeypatch):
+    scraper = SinkScraper()
+    job, records = _run_stream(monkeypatch, scraper, lambda r: r["type"] == "post" and scraper.first_sent.set())
+
+    assert [r["type"] for r in records] == ["post", "post", "profile", "end"]
+    assert [r["post"]["url"] for r in records[:2]] == ["app.a/1", "app.a/2"]
+    assert job.ordered_results() == [{"profile_info": {"username": "app.a"}, "posts": [], "streamed_posts": 2}]
+    assert job.events == []
+
+
+def test_posts_from_scraper_without_sink_are_dropped_after_streaming(monkeypatch):
+    job, records = _run_stream(monkeypatch, PlainScraper())
+
+    assert [r["type"] for r in records] == ["profile", "post", "post", "end"]
+    assert job.ordered_results()[0]["posts"] == []
+    assert job.ordered_results()[0]["streamed_posts"] == 2
+
+
+def test_playstore_reviews_go_to_sink(monkeypatch, tmp_path):
+    playstore = pytest.importorskip("scrapers.playstore")
+    reviews = [{"reviewId": f"r{i}", "content": f"ulasan {i}", "score": 5, "at": datetime(2024, 6, 10 - i)} for i in range(5)]
+
+    class Token(int):
+        token = "next"
+
+    def fake_reviews(app_id, count, continuation_token=None, **kw):
+        start = continuation_token or 0
+        end = start + min(count, 2)
+        return reviews[start:end], (Token(end) if end < len(reviews) else None)
+
+    monkeypatch.setattr(playstore, "app", lambda app_id, **kw: {"title": "Demo", "score": 4.5})
+    monkeypatch.setattr(playstore, "reviews", fake_reviews)
+
+    scraper = playstore.PlayStoreScraper(history_dir=str(tmp_path))
+    streamed = []
+    result = scraper.get_detailed_data("com.demo", max_posts=10, incremental=True, on_post=streamed.append)
+
+    assert [p["review_id"] for p in streamed] == ["r0", "r1", "r2", "r3", "r4"]
+    assert result["posts"] == [] and result["metadata"]["new_reviews"] == 5
+    assert len(scraper._load_history("com.demo", "id", "id")["posts"]) == 5
+
+
+def test_instagram_hybrid_edges_go_to_sink():
+    instagram = pytest.importorskip("scrapers.instagram")
+    user = {"id": "1", "username": "demo", "edge_followed_by": {"count": 100}}
+    edges = ({"node": {"shortcode": f"p{i}", "taken_at_timestamp": 1717000000 - i,
+                       "edge_media_preview_like": {"count": 10}, "edge_media_to_comment": {"count": 0}}} for i in range(5))
+    streamed = []
+    result = instagram.build_hybrid_result(user, "demo", "now", edges, max_posts=3, on_post=streamed.append)
+
+    assert [p["url"] for p in streamed] == [f"https://www.instagram.com/p/p{i}/" for i in range(3)]
+    assert result["posts"] == [] and result["profile_info"]["avg_likes"] == 10
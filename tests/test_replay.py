@@ -0,0 +1,83 @@
+import io
+import json
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from utils import replay
+from utils.replay import ReplayStore
+
+SEC_UID = "MS4wLjABAAAA" + "x" * 64
+
+
+def _profile_html():
+    detail = {"statusCode": 0, "userInfo": {
+        "user": {"id": "6789", "uniqueId": "demo", "secUid": SEC_UID},
+        "stats": {"videoCount": 4},
+        "itemList": [{"id": "1"}],
+    }}
+    data = json.dumps({"__DEFAULT_SCOPE__": {"webapp.user-detail": detail}})
+    return f'<html><script id="__UNIVERSAL_DATA_FOR_REHYDRATION__" type="application/json">{data}</script></html>'.encode()
+
+
+def _item(i, ts):
+    return {"id": str(i), "desc": f"video {i}", "createTime": ts, "author": {"uniqueId": "demo", "secUid": SEC_UID},
+            "stats": {"diggCount": i, "commentCount": 0, "playCount": 0, "shareCount": 0}}
+
+
+def _item_list(query):
+    # Halaman pertama diminta dengan cursor = waktu sekarang (ms), berikutnya dari createTime terakhir
+    if int(query["cursor"][0]) > (time.time() - 3600) * 1000:
+        return {"itemList": [_item(4, 1717400000), _item(3, 1717300000)], "hasMorePrevious": True}
+    return {"itemList": [_item(2, 1717200000), _item(1, 1717100000)], "hasMorePrevious": False}
+
+
+def test_key_ignores_volatile_params():
+    a = "https://www.tiktok.com/api/creator/item_list/?aid=1988&cursor=1792320488427&device_id=7271&secUid=abc&verifyFp=verify_a0f6d02"
+    b = "https://www.tiktok.com/api/creator/item_list/?aid=1988&cursor=1717300000000&device_id=7301&secUid=abc&verifyFp=verify_221E12c"
+    assert ReplayStore.key("GET", a) == ReplayStore.key("GET", b)
+    assert ReplayStore.key("GET", a) != ReplayStore.key("GET", b.replace("secUid=abc", "secUid=def"))
+
+
+def test_same_key_is_served_in_recorded_order_and_rewinds(tmp_path):
+    path = str(tmp_path / "fixtures.jsonl")
+    recorder = ReplayStore(path, "record")
+    key = ReplayStore.key("GET", "https://example.com/page?cursor=1")
+    for body in (b"page-1", b"page-2"):
+        recorder.record(key, 200, [], body)
+
+    store = ReplayStore(path, "replay")
+    assert [store.next(key)[2] for _ in range(3)] == [b"page-1", b"page-2", b"page-2"]
+    store.rewind()
+    assert store.next(key)[2] == b"page-1"
+
+
+def test_tiktok_user_playlist_replays_offline(tmp_path, monkeypatch):
+    yt_dlp = pytest.importorskip("yt_dlp")
+    from yt_dlp.networking import Response
+
+    def upstream(self, req):
+        url = req if isinstance(req, str) else req.url
+        parts = urlsplit(url)
+        body = json.dumps(_item_list(parse_qs(parts.query))).encode() if "item_list" in parts.path else _profile_html()
+        return Response(io.BytesIO(body), url=url, headers={"Content-Type": "text/html"}, status=200)
+
+    def offline(self, req):
+        raise AssertionError("network dipanggil saat replay")
+
+    def video_ids():
+        with yt_dlp.YoutubeDL({"quiet": True, "no_warnings": True, "extract_flat": True}) as ydl:
+            info = ydl.extract_info("https://www.tiktok.com/@demo", download=False, process=False)
+            return [entry["id"] for entry in info["entries"]]
+
+    path = str(tmp_path / "tiktok.jsonl")
+    monkeypatch.setattr(yt_dlp.YoutubeDL, "urlopen", upstream)
+    replay._install_ytdlp(ReplayStore(path, "record"))
+    recorded = video_ids()
+
+    # Proses replay memakai device_id, verifyFp dan cursor awal yang berbeda
+    time.sleep(0.01)
+    monkeypatch.setattr(yt_dlp.YoutubeDL, "urlopen", offline)
+    replay._install_ytdlp(ReplayStore(path, "replay"))
+    assert video_ids() == recorded == ["4", "3", "2", "1"]
@@ -0,0 +1,53 @@
+import io
+import json
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+yt_dlp = pytest.importorskip("yt_dlp")
+from yt_dlp.networking import Response
+
+from scrapers.tiktok import TikTokScraper
+
+SEC_UID = "MS4wLjABAAAA" + "x" * 64
+
+
+def _item(i):
+    return {"id": str(i), "desc": f"video {i}", "createTime": int(time.time()) - i * 60,
+            "author": {"uniqueId": "demo", "secUid": SEC_UID},
+            "stats": {"diggCount": i, "commentCount": 0, "playCount": 0, "shareCount": 0}}
+
+
+class Upstream:
+    """Profil + item_list 2 video per halaman (3 halaman), menghitung request item_list"""
+
+    def __init__(self):
+        self.pages = 0
+
+    def __call__(self, ydl, req):
+        url = req if isinstance(req, str) else req.url
+        parts = urlsplit(url)
+        if "item_list" in parts.path:
+            self.pages += 1
+            first = 2 * (self.pages - 1) + 1
+            body = {"itemList": [_item(first), _item(first + 1)], "hasMorePrevious": self.pages < 3}
+            content = json.dumps(body).encode()
+        else:
+            detail = {"statusCode": 0, "userInfo": {"user": {"id": "6789", "uniqueId": "demo", "secUid": SEC_UID},
+                                                    "stats": {"videoCount": 6}, "itemList": [{"id": "1"}]}}
+            data = json.dumps({"__DEFAULT_SCOPE__": {"webapp.user-detail": detail}})
+            content = f'<html><script id="__UNIVERSAL_DATA_FOR_REHYDRATION__" type="application/json">{data}</script></html>'.encode()
+        return Response(io.BytesIO(content), url=url, headers={"Content-Type": "text/html"}, status=200)
+
+
+@pytest.mark.parametrize("max_posts,pages", [(2, 1), (3, 2)])
+def test_playlist_pages_stop_at_max_posts(monkeypatch, max_posts, pages):
+    upstream = Upstream()
+    monkeypatch.setattr(yt_dlp.YoutubeDL, "urlopen", lambda self, req: upstream(self, req))
+    scraper = TikTokScraper()
+    monkeypatch.setattr(scraper, "_fetch_profile", lambda url: {})
+
+    result = scraper.get_data("demo", max_posts=max_posts)
+    assert len(result["posts"]) == max_posts
+    assert upstream.pages == pages
@@ -23,6 +23,15 @@ def render_terminal_logs(logs):
         # Menggunakan widget standar Streamlit
         st.code(log_text, language="bash")
 
+def render_cache_stats(stats):
+    st.markdown("### 🗄️ HTTP Cache")
+
+    if not stats:
+        st.caption("Belum ada request HTTP yang melewati cache.")
+    else:
+        rows = [{"platform": ns, **counts} for ns, counts in stats.items()]
+        st.dataframe(rows, use_container_width=True, hide_index=True)
+
 def render_documentation():
     st.title("📖 Dokumentasi & Panduan Pengguna")
     st.markdown("""
@@ -2,16 +2,19 @@ from sys import platform
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
-from scrapers.instagram import InstagramScraper
-from scrapers.playstore import PlayStoreScraper
-from scrapers.tiktok import TikTokScraper
-from scrapers.shopee import ShopeeScraper
-from scrapers.googlemaps import GoogleMapsScraper
-from scrapers.googlenews import GoogleNewsScraper
-from scrapers.googlejobs import GoogleJobsScraper
-from scrapers.linkedin import LinkedInScraper
+from scrapers.base import FIELD_PROFILES, DEFAULT_FIELDS
+from scrapers.registry import platforms, create_scraper, scrape_many
 from utils.logger import log_activity
-import time
+from utils.batch import MAX_WORKERS
+from utils.cache_stats import cache_stats_summary
+
+def _gnews_controls():
+    """Opsi khusus GoogleNews/GoogleJobs: gabung keyword dan query per jendela waktu"""
+    merge_keywords = st.checkbox("Gabungkan Keyword (dedup URL)", value=False, help="Semua keyword diambil paralel dalam satu pass; artikel yang sama digabung menjadi satu baris beserta daftar keyword-nya.")
+    slice_days = None
+    if st.checkbox("Time-sliced Query", value=False, help="Pecah rentang tanggal menjadi beberapa jendela yang di-query paralel untuk melewati batas hasil per query."):
+        slice_days = st.number_input("Ukuran jendela (hari)", min_value=1, max_value=30, value=1)
+    return merge_keywords, slice_days
 
 def render_sidebar():
     # logo_url = "https://raw.githubusercontent.com/naufalnashif/naufalnashif.github.io/main/assets/img/my-logo.png"
@@ -34,7 +37,7 @@ def render_sidebar():
 
 
         # 1. Platform Selection
-        platform_choice = st.selectbox("Platform", ["Instagram", "Shopee", "TikTok", "PlayStore", "GoogleMaps", "GoogleNews", "GoogleJobs", "LinkedIn"], index=0)
+        platform_choice = st.selectbox("Platform", platforms(), index=0)
 
         # 2. Input Section
         with st.expander("📥 Input Configuration", expanded=True):
@@ -55,8 +58,10 @@ def render_sidebar():
                 instruction, placeholder, default_val = "Masukkan nama tempat", "Contoh: KFC Terdekat", "KFC Terdekat, Mall Terdekat"
             elif platform_choice == "GoogleNews":
                 instruction, placeholder, default_val = "Masukkan keyword berita", "Contoh: Ekonomi Indonesia", "Ekonomi Indonesia, Politik Nasional"
+                merge_keywords, slice_days = _gnews_controls()
             elif platform_choice == "GoogleJobs":
                 instruction, placeholder, default_val = "Masukkan keyword pekerjaan", "Contoh: Data Analyst", "Data Analyst, Software Engineer"
+                merge_keywords, slice_days = _gnews_controls()
             elif platform_choice == "LinkedIn":
                 instruction, placeholder, default_val = "Masukkan keyword pekerjaan", "Contoh: Data Analyst", "Data Analyst, Data Engieneer, Data Scientist, BI Developer"
             elif platform_choice == "Instagram":
@@ -83,6 +88,7 @@ def render_sidebar():
                 sel_app = st.selectbox("Aplikasi Populer", list(app_defaults.keys()))
                 if sel_app != "Manual":
                     default_val = app_defaults[sel_app]
+                ps_incremental = st.checkbox("Incremental Sync", value=False, help="Hanya ambil ulasan baru sejak sync terakhir lalu gabungkan dengan riwayat tersimpan.")
 
             if input_method == "Manual Text":
                 raw_input = st.text_area(instruction, value=default_val, placeholder=placeholder, help="Gunakan koma atau baris baru untuk memisahkan antar target.")
@@ -125,6 +131,9 @@ def render_sidebar():
             if use_date_filter:
                 since_date = st.date_input("Get posts since:", datetime.now() - timedelta(days=30))
 
+            # Profil kolom: "fast" melewati enrichment yang butuh request tambahan per item
+            fields = st.selectbox("Field Profile", list(FIELD_PROFILES), index=FIELD_PROFILES.index(DEFAULT_FIELDS), help="fast: tanpa detail mahal (lokasi/tag IG Deep, halaman detail LinkedIn). full: semua kolom.")
+
             # 3. Mode Toggle
         mode = st.toggle("Gunakan Flask API", value=False)
 
@@ -135,71 +144,50 @@ def render_sidebar():
             else:
                 st.session_state.all_results = [] 
                 
-                # --- INISIALISASI SCRAPER (Satu kali di luar loop) ---
+                # --- INISIALISASI SCRAPER (Satu kali di luar loop, modul diimpor saat dipilih) ---
+                scraper = create_scraper(platform_choice)
+
+                # Opsi seragam untuk scraper.scrape(target, options)
+                options = {"max_posts": max_posts, "since_date": since_date, "fields": fields}
                 if platform_choice == "Instagram":
-                    scraper = InstagramScraper()
-                elif platform_choice == "TikTok":
-                    scraper = TikTokScraper()
+                    # Penambahan logika pemilihan metode khusus Instagram
+                    options["method"] = "hybrid" if ig_method == "Hybrid (Safe/Fast)" else "deep"
                 elif platform_choice == "PlayStore":
-                    scraper = PlayStoreScraper()
-                elif platform_choice == "GoogleMaps":
-                    scraper = GoogleMapsScraper()
-                elif platform_choice == "GoogleNews":
-                    scraper = GoogleNewsScraper()
-                elif platform_choice == "GoogleJobs":
-                    scraper = GoogleJobsScraper()
-                elif platform_choice == "LinkedIn":
-                    scraper = LinkedInScraper()
-                else:
-                    scraper = ShopeeScraper()
+                    options["incremental"] = ps_incremental
+                elif platform_choice in ("GoogleNews", "GoogleJobs"):
+                    options["slice_days"] = slice_days
                 
                 progress_text = st.empty()
                 progress_bar = st.progress(0)
+
+                def on_target_done(idx, t, res, done_count):
+                    # Dipanggil dari thread utama, aman untuk update widget
+                    if isinstance(res, dict) and res.get("error"):
+                        log_activity(f"Error scraping {t}: {res['error']}")
+                    else:
+                        log_activity(f"Selesai {t} via {platform_choice}")
+                    progress_text.text(f"Processing ({done_count}/{len(targets)}): {t}")
+                    progress_bar.progress(done_count / len(targets))
+
+                # --- EKSEKUSI BATCH (PARALEL, URUTAN HASIL = URUTAN INPUT) ---
+                log_activity(f"Scraping {len(targets)} target via {platform_choice}...")
+                if platform_choice in ("GoogleNews", "GoogleJobs") and merge_keywords:
+                    # Satu pass paralel, hasil digabung per URL
+                    res = scraper.get_data_many(targets, max_posts=max_posts, max_workers=MAX_WORKERS, since_date=since_date, slice_days=slice_days)
+                    on_target_done(0, f"{len(targets)} keyword", res, len(targets))
+                    st.session_state.all_results = [res]
+                else:
+                    # Batas worker per platform/opsi (mis. Instaloader Deep serial) diatur scraper
+                    st.session_state.all_results = scrape_many(
+                        platform_choice, targets, options,
+                        scraper=scraper,
+                        on_done=on_target_done
+                    )
                 
-                # --- LOOP TARGET ---
-                for idx, t in enumerate(targets):
-                    progress_text.text(f"Processing ({idx+1}/{len(targets)}): {t}")
-                    log_activity(f"Scraping {t} via {platform_choice}...")
-                    
-                    try:
-                        if platform_choice == "Instagram":
-                            # Penambahan logika pemilihan metode khusus Instagram
-                            if ig_method == "Hybrid (Safe/Fast)":
-                                res = scraper.get_data_hybrid(t, max_posts=max_posts, since_date=since_date)
-                            else:
-                                res = scraper.get_detailed_data(t, max_posts=max_posts, since_date=since_date)
-                        
-                        elif platform_choice == "TikTok":
-                            # Tetap menggunakan get_data yang sudah stabil
-                            res = scraper.get_data(t, max_posts=max_posts, since_date=since_date)
-                            
-                        elif platform_choice == "PlayStore":
-                            # Tetap menggunakan get_data yang sudah stabil
-                            res = scraper.get_detailed_data(t, max_posts=max_posts)
-                        # Di dalam sidebar.py pada bagian logika elif
-                        elif platform_choice == "GoogleMaps":
-                            res = scraper.get_data(t, max_posts=max_posts) 
-                        elif platform_choice == "GoogleNews":
-                            res = scraper.get_data(t, max_posts=max_posts) 
-                        elif platform_choice == "GoogleJobs":
-                            res = scraper.get_data(t, max_posts=max_posts) 
-                        elif platform_choice == "LinkedIn":
-                            res = scraper.get_data(t, max_posts=max_posts) 
-
-                        else:
-                            # Shopee atau platform lainnya
-                            res = scraper.get_data(t, max_posts=max_posts, since_date=since_date)
-                        
-                        st.session_state.all_results.append(res)
-                        
-                    except Exception as e:
-                        log_activity(f"Error scraping {t}: {str(e)}")
-                        st.session_state.all_results.append({"error": str(e), "platform": platform_choice})
-                    
-                    # Update Progress
-                    progress_bar.progress((idx + 1) / len(targets))
-                    time.sleep(0.5) 
-                
+                cache_stats = cache_stats_summary().get(platform_choice)
+                if cache_stats:
+                    log_activity(f"HTTP cache {platform_choice}: hit {cache_stats['hit']}, revalidated {cache_stats['revalidated']}, miss {cache_stats['miss']}")
+
                 progress_text.text("✅ Scraping Selesai!")
                 st.success(f"Berhasil mengambil {len(st.session_state.all_results)} data.")
                 st.rerun()
\ No newline at end of file
@@ -0,0 +1,47 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Batas worker paralel per platform (platform yang ketat rate-limit dibuat kecil)
+PLATFORM_CONCURRENCY = {
+    "Instagram": 4,
+    "TikTok": 4,
+    "Shopee": 6,
+    "PlayStore": 6,
+    "GoogleMaps": 4,
+    "GoogleNews": 6,
+    "GoogleJobs": 6,
+    "LinkedIn": 2,
+}
+DEFAULT_CONCURRENCY = 4
+MAX_WORKERS = 8
+
+
+def get_concurrency(platform, max_workers=MAX_WORKERS):
+    """Jumlah worker untuk sebuah platform, dibatasi oleh pool global"""
+    return max(1, min(PLATFORM_CONCURRENCY.get(platform, DEFAULT_CONCURRENCY), max_workers))
+
+
+def run_batch(targets, task, platform=None, max_workers=MAX_WORKERS, on_done=None, indexed=False):
+    """
+    Menjalankan task(target) secara paralel dan mengembalikan hasil sesuai urutan input.
+    Dengan indexed=True task dipanggil sebagai task(idx, target).
+
+    on_done(idx, target, result, done_count) dipanggil dari thread pemanggil setiap kali
+    satu target selesai, sehingga aman untuk update widget Streamlit.
+    """
+    results = [None] * len(targets)
+    if not targets:
+        return results
+
+    workers = min(get_concurrency(platform, max_workers), len(targets))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {(pool.submit(task, idx, t) if indexed else pool.submit(task, t)): idx for idx, t in enumerate(targets)}
+        for done_count, future in enumerate(as_completed(futures), 1):
+            idx = futures[future]
+            try:
+                res = future.result()
+            except Exception as e:
+                res = {"error": str(e), "platform": platform}
+            results[idx] = res
+            if on_done:
+                on_done(idx, targets[idx], res, done_count)
+    return results
@@ -0,0 +1,18 @@
+import threading
+
+# Penghitung hit/revalidated/miss cache HTTP per platform. Dipisah dari utils.http_cache
+# agar UI bisa membacanya tanpa mengimpor httpx saat start.
+_stats_lock = threading.Lock()
+CACHE_STATS = {}
+
+
+def count(namespace, event):
+    with _stats_lock:
+        ns = CACHE_STATS.setdefault(namespace, {"hit": 0, "revalidated": 0, "miss": 0})
+        ns[event] += 1
+
+
+def cache_stats_summary():
+    """Ringkasan hit/miss per platform untuk tab Logs"""
+    with _stats_lock:
+        return {ns: dict(counts) for ns, counts in CACHE_STATS.items()}
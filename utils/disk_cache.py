@@ -0,0 +1,63 @@
+import json
+import os
+import threading
+import time
+
+CACHE_DIR = os.environ.get("SCRAPER_CACHE_DIR", ".cache")
+
+
+class JsonTTLCache:
+    """
+    Cache key -> value kecil (JSON) yang disimpan ke disk agar bisa dipakai lintas proses.
+
+    Entri kedaluwarsa setelah `ttl` detik; jika jumlah entri melebihi `max_entries`,
+    entri yang paling lama tidak dipakai akan dibuang.
+    """
+
+    def __init__(self, name, ttl=7 * 24 * 3600, max_entries=5000, cache_dir=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.path = os.path.join(cache_dir or CACHE_DIR, f"{name}.json")
+        self._lock = threading.Lock()
+        self._data = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._data, f)
+        os.replace(tmp_path, self.path)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if not entry:
+                return None
+            if time.time() - entry["ts"] > self.ttl:
+                del self._data[key]
+                return None
+            entry["used"] = time.time()
+            return entry["value"]
+
+    def set(self, key, value):
+        with self._lock:
+            now = time.time()
+            self._data[key] = {"value": value, "ts": now, "used": now}
+            if len(self._data) > self.max_entries:
+                # Buang yang kedaluwarsa dulu, lalu yang paling lama tidak dipakai
+                self._data = {k: v for k, v in self._data.items() if now - v["ts"] <= self.ttl}
+                overflow = len(self._data) - self.max_entries
+                if overflow > 0:
+                    for k in sorted(self._data, key=lambda k: self._data[k]["used"])[:overflow]:
+                        del self._data[k]
+            try:
+                self._save()
+            except OSError:
+                pass
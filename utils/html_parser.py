@@ -0,0 +1,37 @@
+import os
+from functools import lru_cache
+
+# Urutan preferensi mode "auto": engine C lebih dulu, html.parser (bawaan) sebagai fallback
+BACKENDS = ("selectolax", "lxml", "html.parser")
+HTML_PARSER = os.environ.get("SCRAPER_HTML_PARSER", "auto")
+
+
+@lru_cache(maxsize=None)
+def _installed(backend):
+    if backend == "html.parser":
+        return True
+    try:
+        if backend == "selectolax":
+            import selectolax.lexbor  # noqa: F401
+        elif backend == "lxml":
+            import lxml.etree  # noqa: F401
+        else:
+            return False
+        return True
+    except ImportError:
+        return False
+
+
+def available_backends():
+    return [b for b in BACKENDS if _installed(b)]
+
+
+def resolve_backend(name=None):
+    """
+    Memilih backend parser HTML: nama eksplisit, env SCRAPER_HTML_PARSER, atau "auto".
+    Backend yang diminta tetapi tidak terpasang jatuh ke pilihan "auto".
+    """
+    name = name or HTML_PARSER
+    if name != "auto" and name in BACKENDS and _installed(name):
+        return name
+    return available_backends()[0]
@@ -0,0 +1,72 @@
+import httpx
+
+from utils.http_cache import CachingTransport, HTTP_CACHE_ENABLED
+from utils.replay import ReplayStore, active_store
+
+DEFAULT_POOL_LIMITS = {
+    "max_connections": 20,
+    "max_keepalive_connections": 10,
+    "keepalive_expiry": 30.0,
+}
+
+
+class ReplayTransport(httpx.BaseTransport):
+    """Transport pembungkus untuk mode record/replay (lihat utils.replay)"""
+    _DROP = {"content-encoding", "content-length", "transfer-encoding"}
+
+    def __init__(self, transport, store):
+        self.transport = transport
+        self.store = store
+
+    def handle_request(self, request):
+        key = ReplayStore.key(request.method, str(request.url), request.read())
+        if self.store.mode == "replay":
+            status, headers, body = self.store.next(key)
+            return httpx.Response(status, headers=headers, content=body, request=request)
+
+        response = self.transport.handle_request(request)
+        body = response.read()
+        response.close()
+        headers = [(k, v) for k, v in response.headers.items() if k.lower() not in self._DROP]
+        self.store.record(key, response.status_code, headers, body)
+        return httpx.Response(response.status_code, headers=headers, content=body, request=request)
+
+    def close(self):
+        self.transport.close()
+
+
+def wrap_transport(transport):
+    """Membungkus transport httpx jika mode record/replay aktif"""
+    store = active_store()
+    if store is None:
+        return transport
+    return ReplayTransport(transport, store)
+
+
+def _http2_available():
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def build_client(headers=None, timeout=20.0, follow_redirects=True, http2=False, pool_limits=None, cache=None, cache_ttl=None):
+    """
+    Membuat httpx.Client berumur panjang (keep-alive) untuk dipakai ulang lintas target.
+
+    HTTP/2 hanya diaktifkan jika diminta dan paket `h2` terpasang. Jika `cache` diisi
+    nama platform, respons GET disimpan di cache disk (lihat utils.http_cache). Dalam
+    mode record/replay (utils.replay) transport dibungkus paling luar.
+    """
+    limits = httpx.Limits(**{**DEFAULT_POOL_LIMITS, **(pool_limits or {})})
+    transport = httpx.HTTPTransport(http2=http2 and _http2_available(), limits=limits)
+    if cache and HTTP_CACHE_ENABLED:
+        transport = CachingTransport(cache, ttl=cache_ttl, transport=transport)
+    transport = wrap_transport(transport)
+    return httpx.Client(
+        headers=headers,
+        timeout=timeout,
+        follow_redirects=follow_redirects,
+        transport=transport,
+    )
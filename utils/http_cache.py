@@ -0,0 +1,133 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+
+import httpx
+
+from utils.cache_stats import count as _count
+from utils.disk_cache import CACHE_DIR
+
+HTTP_CACHE_DIR = os.path.join(CACHE_DIR, "http")
+HTTP_CACHE_ENABLED = os.environ.get("SCRAPER_HTTP_CACHE", "1") != "0"
+
+# TTL (detik) per platform; respons lebih tua dari TTL direvalidasi (ETag/Last-Modified) jika bisa
+PLATFORM_TTLS = {
+    "Instagram": 3600,
+    "TikTok": 3600,
+    "Shopee": 6 * 3600,
+    "GoogleMaps": 24 * 3600,
+    "LinkedIn": 6 * 3600,
+}
+DEFAULT_TTL = 3600
+
+# Header yang tidak ikut disimpan: body disimpan dalam bentuk sudah didekode
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie"}
+
+class CachingTransport(httpx.BaseTransport):
+    """
+    Transport httpx dengan cache respons GET di disk.
+
+    Key = hash method/URL (termasuk params). Metadata disimpan per key, body disimpan
+    terkompresi gzip dan dialamatkan berdasarkan hash isinya (body identik disimpan sekali).
+    """
+
+    def __init__(self, namespace, ttl=None, transport=None, cache_dir=None):
+        self.namespace = namespace
+        self.ttl = PLATFORM_TTLS.get(namespace, DEFAULT_TTL) if ttl is None else ttl
+        self.transport = transport or httpx.HTTPTransport()
+        self.root = os.path.join(cache_dir or HTTP_CACHE_DIR, namespace)
+
+    # --- storage ---
+    def _key(self, request):
+        return hashlib.sha256(f"{request.method} {request.url}".encode("utf-8")).hexdigest()
+
+    def _meta_path(self, key):
+        return os.path.join(self.root, "meta", key[:2], f"{key}.json")
+
+    def _body_path(self, digest):
+        return os.path.join(self.root, "bodies", digest[:2], f"{digest}.gz")
+
+    @staticmethod
+    def _write_atomic(path, payload):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+    def _load(self, key):
+        try:
+            with open(self._meta_path(key), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with gzip.open(self._body_path(meta["body"]), "rb") as f:
+                return meta, f.read()
+        except (OSError, ValueError, KeyError):
+            return None, None
+
+    def _store(self, key, response, body):
+        digest = hashlib.sha256(body).hexdigest()
+        body_path = self._body_path(digest)
+        if not os.path.exists(body_path):
+            self._write_atomic(body_path, gzip.compress(body))
+        meta = {
+            "stored_at": time.time(),
+            "status": response.status_code,
+            "headers": [(k, v) for k, v in response.headers.items() if k.lower() not in _DROP_HEADERS],
+            "body": digest,
+        }
+        self._write_atomic(self._meta_path(key), json.dumps(meta).encode("utf-8"))
+
+    def _touch(self, key, meta):
+        meta["stored_at"] = time.time()
+        self._write_atomic(self._meta_path(key), json.dumps(meta).encode("utf-8"))
+
+    @staticmethod
+    def _build_response(request, meta, body):
+        return httpx.Response(meta["status"], headers=meta["headers"], content=body, request=request)
+
+    # --- transport ---
+    def handle_request(self, request):
+        if request.method != "GET":
+            return self.transport.handle_request(request)
+
+        key = self._key(request)
+        meta, body = self._load(key)
+        if meta and time.time() - meta["stored_at"] < self.ttl:
+            _count(self.namespace, "hit")
+            return self._build_response(request, meta, body)
+
+        # Revalidasi kondisional jika host memberi ETag/Last-Modified
+        if meta:
+            lowered = {k.lower(): v for k, v in meta["headers"]}
+            if lowered.get("etag"):
+                request.headers["If-None-Match"] = lowered["etag"]
+            if lowered.get("last-modified"):
+                request.headers["If-Modified-Since"] = lowered["last-modified"]
+
+        response = self.transport.handle_request(request)
+        if meta and response.status_code == 304:
+            response.close()
+            self._touch(key, meta)
+            _count(self.namespace, "revalidated")
+            return self._build_response(request, meta, body)
+
+        _count(self.namespace, "miss")
+        if response.status_code != 200:
+            return response
+
+        fresh_body = response.read()
+        response.close()
+        try:
+            self._store(key, response, fresh_body)
+        except OSError:
+            pass
+        return self._build_response(request, {
+            "status": response.status_code,
+            "headers": [(k, v) for k, v in response.headers.items() if k.lower() not in _DROP_HEADERS],
+        }, fresh_body)
+
+    def close(self):
+        self.transport.close()
@@ -0,0 +1,22 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """Pembatas request per detik yang aman dipakai bersama oleh banyak thread"""
+
+    def __init__(self, requests_per_second=1.0):
+        self.interval = 1.0 / requests_per_second if requests_per_second and requests_per_second > 0 else 0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
@@ -0,0 +1,233 @@
+"""
+Mode record/replay untuk menjalankan scraper secara offline dan deterministik.
+
+    SCRAPER_REPLAY_MODE=record  -> setiap respons upstream disimpan ke file fixture
+    SCRAPER_REPLAY_MODE=replay  -> respons dilayani dari file fixture, tanpa network
+    SCRAPER_REPLAY_FILE=...     -> lokasi fixture (default .cache/replay/fixtures.jsonl)
+
+Hook yang dipasang: transport httpx (dibungkus oleh utils.http.build_client), requests (instaloader, newspaper/gnews),
+urllib (feedparser/gnews, google-play-scraper) dan YoutubeDL.urlopen (yt-dlp).
+"""
+import base64
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import defaultdict
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from utils.disk_cache import CACHE_DIR
+
+DEFAULT_FIXTURE = os.path.join(CACHE_DIR, "replay", "fixtures.jsonl")
+
+# Parameter query yang berubah di setiap run (acak/berbasis waktu) dan tidak ikut kunci.
+# yt-dlp TikTok: device_id & verifyFp acak, cursor awal = waktu sekarang (ms); halaman
+# dengan kunci sama dilayani sesuai urutan rekaman sehingga paging tetap benar.
+VOLATILE_PARAMS = {"device_id", "verifyFp", "cursor", "_rticket", "ts", "openudid", "last_install_time", "msToken", "X-Bogus", "_signature"}
+
+_store = None
+
+
+class ReplayMissError(LookupError):
+    """Request tidak ditemukan di fixture saat mode replay"""
+
+
+class ReplayStore:
+    """
+    Fixture JSONL: satu baris per respons. Request identik dilayani berurutan sesuai
+    urutan rekaman; respons terakhir dipakai ulang jika request diulang lebih sering.
+    rewind() memulai urutan dari awal lagi (mis. untuk mengulang batch yang sama).
+    """
+
+    def __init__(self, path, mode):
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._entries = defaultdict(list)
+        self._positions = {}
+        if mode == "replay":
+            self._load()
+        else:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    @staticmethod
+    def normalize_url(url):
+        """URL tanpa VOLATILE_PARAMS (urutan parameter lain dipertahankan)"""
+        parts = urlsplit(url)
+        if not parts.query:
+            return url
+        query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in VOLATILE_PARAMS]
+        return urlunsplit(parts._replace(query=urlencode(query)))
+
+    @staticmethod
+    def key(method, url, body=None):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        digest = hashlib.sha256(body or b"").hexdigest()[:16]
+        return f"{method.upper()} {ReplayStore.normalize_url(url)} {digest}"
+
+    def _load(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries[entry["key"]].append(entry)
+
+    def record(self, key, status, headers, body):
+        entry = {
+            "key": key,
+            "status": status,
+            "headers": [[k, v] for k, v in headers],
+            "body": base64.b64encode(body or b"").decode("ascii"),
+        }
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+
+    def next(self, key):
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                raise ReplayMissError(f"Tidak ada respons tersimpan untuk {key}")
+            pos = self._positions.get(key, 0)
+            entry = entries[min(pos, len(entries) - 1)]
+            self._positions[key] = pos + 1
+        return entry["status"], entry["headers"], base64.b64decode(entry["body"])
+
+    def rewind(self):
+        with self._lock:
+            self._positions.clear()
+
+
+def active_store():
+    """Store aktif, None jika mode record/replay tidak dipasang"""
+    return _store
+
+
+# --- requests (instaloader, newspaper) ---
+def _install_requests(store):
+    try:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from requests.structures import CaseInsensitiveDict
+        from requests.utils import get_encoding_from_headers
+    except ImportError:
+        return
+
+    original_send = HTTPAdapter.send
+
+    def build(request, status, headers, body):
+        resp = requests.Response()
+        resp.status_code = status
+        resp.headers = CaseInsensitiveDict(headers)
+        resp._content = body
+        resp.url = request.url
+        resp.request = request
+        resp.encoding = get_encoding_from_headers(resp.headers)
+        return resp
+
+    def send(self, request, **kwargs):
+        key = ReplayStore.key(request.method, request.url, request.body)
+        if store.mode == "replay":
+            return build(request, *store.next(key))
+        resp = original_send(self, request, **kwargs)
+        # resp.content sudah didekode, jadi header encoding tidak ikut disimpan
+        headers = [(k, v) for k, v in resp.headers.items() if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")]
+        store.record(key, resp.status_code, headers, resp.content)
+        return build(request, resp.status_code, headers, resp.content)
+
+    HTTPAdapter.send = send
+
+
+# --- urllib (feedparser, google-play-scraper) ---
+def _install_urllib(store):
+    import urllib.request
+    import urllib.response
+    from http.client import HTTPMessage
+    from urllib.error import HTTPError
+
+    original_open = urllib.request.OpenerDirector.open
+
+    def build(url, status, headers, body):
+        msg = HTTPMessage()
+        for k, v in headers:
+            msg[k] = v
+        if status >= 400:
+            raise HTTPError(url, status, "Replayed error", msg, io.BytesIO(body))
+        return urllib.response.addinfourl(io.BytesIO(body), msg, url, status)
+
+    def open_(self, fullurl, data=None, *args, **kwargs):
+        if isinstance(fullurl, str):
+            url, method, body = fullurl, ("POST" if data is not None else "GET"), data
+        else:
+            body = data if data is not None else fullurl.data
+            url, method = fullurl.full_url, fullurl.get_method()
+        key = ReplayStore.key(method, url, body)
+        if store.mode == "replay":
+            return build(url, *store.next(key))
+        try:
+            resp = original_open(self, fullurl, data, *args, **kwargs)
+        except HTTPError as e:
+            err_body = e.read()
+            store.record(key, e.code, list(e.headers.items()), err_body)
+            raise HTTPError(url, e.code, e.msg, e.headers, io.BytesIO(err_body))
+        # urllib tidak mendekode body, jadi header disimpan apa adanya
+        body = resp.read()
+        store.record(key, resp.status, list(resp.headers.items()), body)
+        return build(resp.geturl(), resp.status, list(resp.headers.items()), body)
+
+    urllib.request.OpenerDirector.open = open_
+
+
+# --- yt-dlp ---
+def _install_ytdlp(store):
+    try:
+        import yt_dlp
+        from yt_dlp.networking import Request, Response
+        from yt_dlp.networking.exceptions import HTTPError
+    except ImportError:
+        return
+
+    original_urlopen = yt_dlp.YoutubeDL.urlopen
+
+    def build(url, status, headers, body):
+        resp = Response(io.BytesIO(body), url=url, headers=dict(headers), status=status)
+        if status >= 400:
+            raise HTTPError(resp)
+        return resp
+
+    def urlopen(self, req):
+        if isinstance(req, str):
+            req = Request(req)
+        key = ReplayStore.key(req.method, req.url, req.data)
+        if store.mode == "replay":
+            return build(req.url, *store.next(key))
+        try:
+            resp = original_urlopen(self, req)
+        except HTTPError as e:
+            err_body = e.response.read()
+            store.record(key, e.status, list(e.response.headers.items()), err_body)
+            raise HTTPError(Response(io.BytesIO(err_body), url=e.response.url, headers=e.response.headers, status=e.status))
+        body = resp.read()
+        headers = [(k, v) for k, v in resp.headers.items() if k.lower() not in ("content-encoding", "content-length")]
+        store.record(key, resp.status, headers, body)
+        return build(resp.url, resp.status, headers, body)
+
+    yt_dlp.YoutubeDL.urlopen = urlopen
+
+
+def install(mode, path=None):
+    """Memasang hook record/replay ke semua HTTP stack yang dipakai scraper (sekali per proses)"""
+    global _store
+    if mode not in ("record", "replay") or _store is not None:
+        return _store
+    _store = ReplayStore(path or DEFAULT_FIXTURE, mode)
+    _install_requests(_store)
+    _install_urllib(_store)
+    _install_ytdlp(_store)
+    return _store
+
+
+def install_from_env():
+    return install(os.environ.get("SCRAPER_REPLAY_MODE", ""), os.environ.get("SCRAPER_REPLAY_FILE") or None)
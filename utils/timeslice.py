@@ -0,0 +1,53 @@
+from datetime import date, datetime, timedelta
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor
+
+
+def date_windows(start, end, days):
+    """Membagi rentang [start, end] menjadi jendela (start, end) berukuran `days` hari, terbaru dulu"""
+    windows = []
+    window_end = end
+    while window_end > start:
+        window_start = max(start, window_end - timedelta(days=days))
+        windows.append((window_start, window_end))
+        window_end = window_start
+    return windows
+
+
+def published_datetime(value):
+    """Parse 'published date' GNews (format RFC 2822); None jika gagal"""
+    try:
+        return parsedate_to_datetime(value).replace(tzinfo=None)
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def fetch_windows(fetch, windows, max_workers=6):
+    """
+    Menjalankan fetch(start, end) untuk setiap jendela secara paralel, lalu
+    menggabungkan artikel: dedup berdasarkan URL dan urut tanggal terbaru dulu.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(windows)))) as pool:
+        pages = list(pool.map(lambda w: fetch(*w), windows))
+
+    seen = set()
+    articles = []
+    for page in pages:
+        for article in page or []:
+            url = article.get('url')
+            if url in seen:
+                continue
+            seen.add(url)
+            articles.append(article)
+
+    articles.sort(key=lambda a: published_datetime(a.get('published date')) or datetime.min, reverse=True)
+    return articles
+
+
+def as_gnews_date(d):
+    """GNews menerima start_date/end_date sebagai tuple (tahun, bulan, hari)"""
+    if isinstance(d, datetime):
+        d = d.date()
+    if isinstance(d, date):
+        return (d.year, d.month, d.day)
+    return d